@@ -1,26 +1,52 @@
 import pygame
-import json
 import os
-from typing import List, Optional
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
 from src.models.player import Player
 from src.models.game_object import GameObject
 from src.models.level_manager import LevelManager
+from src.models.world_state import WorldState
 from src.utils.constants import *
-from src.utils.physics import handle_collisions, keep_in_bounds, PhysicsSystem
-from src.utils.settings_manager import SettingsManager
+from src.utils.broadphase import SweepAndPrune
+from src.utils.input_source import InputSource, PygameInputSource, QueuedInputSource, ScriptedInputSource, WorldInputSource
+from src.utils.physics import PhysicsSystem
+from src.utils.physics_world import PhysicsWorld, physics_world_available
+from src.utils.profiler import FrameProfiler
+from src.utils.settings_manager import SettingsManager, path_changed
+from src.views.batch_renderer import BatchRenderer
+from src.views.camera import Camera
+from src.views.game_view import StaticLayer
+from src.views.profiler_overlay import ProfilerOverlay
+from src.views.render_snapshot import RenderSnapshot, SnapshotBuffer
+from src.views.text_renderer import text_renderer
 
 class GameController:
-    def __init__(self):
+    def __init__(self, headless: bool = False, input_source: Optional[InputSource] = None):
         pygame.init()
         self.settings = SettingsManager()
+        self.cfg = self.settings.compiled
         self.physics = PhysicsSystem()  # Initialize physics system
+
+        # Headless mode simulates without a window, fed by scripted input
+        self.headless = headless
+        if input_source is None:
+            input_source = ScriptedInputSource() if headless else PygameInputSource()
+        self.input = input_source
+
+        # Simulation clock, advanced by step()
+        self.tick = 0
+        # Called with the controller after every simulated tick (recording, replay checks)
+        self.tick_listeners: List[Callable[['GameController'], None]] = []
         
         # Initialize display with settings
-        self.screen = pygame.display.set_mode((
-            self.settings.get("window", "width", default=800),
-            self.settings.get("window", "height", default=600)
-        ))
-        pygame.display.set_caption(self.settings.get("window", "title", default="Modifier Mallet"))
+        self.screen = None
+        if not headless:
+            self.screen = pygame.display.set_mode((
+                self.settings.get("window", "width", default=800),
+                self.settings.get("window", "height", default=600)
+            ))
+            pygame.display.set_caption(self.settings.get("window", "title", default="Modifier Mallet"))
         self.clock = pygame.time.Clock()
         self.game_state = GameState.PLAYING
         
@@ -29,53 +55,186 @@ class GameController:
         self.player = None
         self.static_objects = []
         self.dynamic_objects = []
+        self.static_index = None
+        self.dynamic_broadphase = SweepAndPrune()
+        # Sleeping objects woken by wake_island, collected during a tick's pair pass
+        self.woken_objects: List[GameObject] = []
+        self.physics_world: Optional[PhysicsWorld] = None
+        if self.settings.get("physics", "use_physics_world", default=False):
+            if physics_world_available():
+                self.physics_world = PhysicsWorld(self.settings)
+            else:
+                print("Warning: physics.use_physics_world needs NumPy. Using per-object physics.")
         self.goal = None
+        self.initial_state: Optional[WorldState] = None
+
+        # Follows the player through levels larger than the window
+        self.camera = Camera((self.settings.get("window", "width", default=800),
+                              self.settings.get("window", "height", default=600)))
+        # Level geometry, pre-rendered in chunks as it scrolls into view
+        self.static_layer: Optional[StaticLayer] = None
+        self._view_offset = (0, 0)
+        self._drawn_offset = None
+        # Dirty-rect mode: redraw and update only the screen areas that changed
+        self.dirty_rects = self.settings.get("window", "dirty_rects", default=False)
+        self._drawn_areas = {}
+        self._hud_rects: List[pygame.Rect] = []
+        self._full_redraw = True
+        # Dynamic objects are drawn from a pre-rendered atlas in one blits call
+        self.batch = BatchRenderer()
+        self.batch_rendering = self.settings.get("window", "batch_rendering", default=True)
+        # Object draw submissions in the last frame (debug statistics)
+        self.draw_calls = 0
+        self._clear_render_caches = False
+        # Per-phase frame times for the profiler overlay (toggled in game) and dumps
+        self.profiler = FrameProfiler(self.settings.get("debug", "profiler_history", default=600))
+        self.profiler_overlay = ProfilerOverlay()
+        self.show_profiler = self.settings.get("debug", "show_profiler", default=False)
+        # Where run() writes the profiler history on exit (.csv or .jsonl); empty for none
+        self.profile_dump = self.settings.get("debug", "profile_dump", default="")
+        # Opt-in: simulate on a worker thread while this thread renders snapshots
+        self.threaded = self.settings.get("window", "threaded_simulation", default=False)
+        self.snapshots: Optional[SnapshotBuffer] = None
+        self._simulation_thread: Optional[threading.Thread] = None
+        self._sim_running = False
+        self._sim_error: Optional[Exception] = None
+        # Banner shown over the game, e.g. on completion
+        self.message: Optional[str] = None
+
+        self._load_sim_settings()
         self.load_current_level()
-        
-        # FPS display
-        self.fps_font = pygame.font.Font(None, 36)
+        # Apply config.json edits while running (polled by run())
+        self.settings.subscribe(self._on_settings_changed)
 
         # Track the object being dragged
         self.dragged_object: Optional[GameObject] = None
 
+    def _load_sim_settings(self):
+        self.step_time = 1.0 / TICK_RATE
+        # Resting dynamic objects fall asleep and skip physics until disturbed
+        self.sleep_enabled = self.settings.get("physics", "sleep", "enabled", default=True)
+        self.sleep_velocity_threshold = self.settings.get("physics", "sleep", "velocity_threshold", default=0.5)
+        self.sleep_frames = self.settings.get("physics", "sleep", "frames", default=30)
+
+    def _on_settings_changed(self, changed):
+        """Apply a hot-reloaded config.json to the running level."""
+        self.cfg = self.settings.compiled
+        if path_changed(changed, "physics", "sleep"):
+            self._load_sim_settings()
+        if path_changed(changed, "physics", "broadphase_cell_size"):
+            self.static_index = self.level_manager.build_static_index(self.static_objects)
+        if self.physics_world is not None:
+            self.physics_world.cfg = self.cfg
+        # The player subscribes on its own
+        for obj in self.static_objects + self.dynamic_objects + ([self.goal] if self.goal else []):
+            obj.apply_settings(self.cfg, changed)
+        if path_changed(changed, "window", "dirty_rects"):
+            self.dirty_rects = self.cfg.window.dirty_rects
+        if path_changed(changed, "window", "batch_rendering"):
+            self.batch_rendering = self.cfg.window.batch_rendering
+        if (path_changed(changed, "colors") or path_changed(changed, "debug") or path_changed(changed, "ui") or
+                path_changed(changed, "physics", "modifiers", "ghostly_alpha")):
+            self._rebuild_static_layer()
+            self._clear_render_caches = True
+
     def load_current_level(self):
         """Load the current level from the level manager."""
         level_number = self.level_manager.current_level
         static_objects, dynamic_objects, player_start, goal = self.level_manager.load_level(level_number)
-        
+        self.install_level(static_objects, dynamic_objects, player_start, goal)
+        # Name and hints come with the level (or its compiled copy); no second parse
+        self.current_level_data = dict(self.level_manager.level_info)
+
+    def install_level(self, static_objects: List[GameObject], dynamic_objects: List[GameObject],
+                      player_start: Optional[GameObject], goal: Optional[GameObject]):
+        """Make these objects the running level.
+
+        The level manager's static index and world size must already describe
+        them, as they do after LevelManager.load_level(). Also used to play
+        generated scenes (see benchmark).
+        """
         self.static_objects = static_objects
         self.dynamic_objects = dynamic_objects
+        self.static_index = self.level_manager.static_index
+        self.dynamic_broadphase.set_objects(dynamic_objects)
+        if self.physics_world is not None:
+            self.physics_world.set_bodies(dynamic_objects)
         self.goal = goal
+        # Objects are kept inside the level rather than the window
+        world_size = self.level_manager.world_size
+        self.physics.world_size = world_size
+        if self.physics_world is not None:
+            self.physics_world.world_size = world_size
+            self.physics_world.set_static_index(self.static_index)
+        self.camera.set_world_size(world_size)
+        self._rebuild_static_layer()
         
         # Create player at start position
         if player_start:
-            self.player = Player(player_start.rect.x, player_start.rect.y, self.settings)
+            self.player = Player(player_start.rect.x, player_start.rect.y, self.settings,
+                                 input_source=self.input, time_source=self.get_sim_time)
         else:
-            self.player = Player(50, self.settings.get("window", "height") - 100, self.settings)
+            self.player = Player(50, self.settings.get("window", "height") - 100, self.settings,
+                                 input_source=self.input, time_source=self.get_sim_time)
+        self.camera.snap(self.player.rect)
+        # Restored by reset_level() instead of loading the level again
+        self.initial_state = WorldState.capture(self)
 
-        # Load level data for hints and description
-        level_file = f"{self.settings.get('game', 'level_directory', default='levels/')}/level_{level_number + 1}.json"
-        try:
-            with open(level_file, 'r') as f:
-                self.current_level_data = json.load(f)
-        except:
-            self.current_level_data = {
-                "name": f"Level {level_number + 1}",
-                "description": "",
-                "hints": []
-            }
+    def reset_level(self):
+        """Put the current level back to how it was loaded.
+
+        Restores the objects in place from the state captured at load,
+        which takes well under a frame even for huge levels. The level is
+        loaded again only if its file or the settings changed since.
+        """
+        # Ensure dragged object is released on reset
+        if self.dragged_object:
+            self.dragged_object.stop_drag()
+            self.dragged_object = None
+        state = self.initial_state
+        if state is None or not state.is_current(self) or self.level_manager.source_changed():
+            self.load_current_level()
+            return
+        state.restore(self)
+        if self.physics_world is not None:
+            self.physics_world.set_bodies(self.dynamic_objects)
+        self.camera.snap(self.player.rect)
+        # Static objects never change, so the static layer and its chunks are kept
+        self._full_redraw = True
+
+    def _rebuild_static_layer(self):
+        """Re-render level geometry and the goal; they never move during a level."""
+        self._full_redraw = True
+        if self.screen is None:
+            return
+        static_objects = self.static_objects + ([self.goal] if self.goal else [])
+        self.static_layer = StaticLayer(self.level_manager.world_size, self.cfg.colors.background, static_objects)
+
+    def set_input_source(self, input_source: InputSource):
+        """Switch where input comes from, e.g. from a replay to live play."""
+        self.input = input_source
+        self.player.input_source = input_source
+        if self.dragged_object:
+            self.dragged_object.input_source = WorldInputSource(input_source, self.camera)
+
+    def get_sim_time(self) -> float:
+        """Seconds of simulated time since the game started."""
+        return self.tick * self.step_time
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
-                    mouse_x, mouse_y = event.pos
+                    mouse_x, mouse_y = self.camera.to_world(event.pos)
                     clicked_on_draggable = False
                     # Check dynamic objects first for dragging
                     for obj in self.dynamic_objects:
                         if obj.is_draggable and obj.rect.collidepoint(mouse_x, mouse_y):
+                            self.wake_island(obj)
+                            # Drag positions follow the mouse in world coordinates
+                            obj.input_source = WorldInputSource(self.input, self.camera)
                             self.dragged_object = obj
                             obj.start_drag(mouse_x, mouse_y)
                             clicked_on_draggable = True
@@ -83,7 +242,7 @@ class GameController:
                     
                     # If not starting a drag, try using the mallet
                     if not clicked_on_draggable:
-                        self.handle_mallet_use(mouse_pos=event.pos)
+                        self.handle_mallet_use(mouse_pos=(mouse_x, mouse_y))
                         
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:  # Left click release
@@ -93,16 +252,14 @@ class GameController:
                         self.dragged_object = None
                         
             elif event.type == pygame.KEYDOWN:
-                key_pause = self.settings.get("controls", "pause", default=pygame.K_ESCAPE)
-                key_reset = self.settings.get("controls", "reset_level", default=pygame.K_r)
+                key_pause = self.cfg.controls.pause
+                key_reset = self.cfg.controls.reset_level
                 if event.key == key_pause:
                     self.game_state = GameState.PAUSED if self.game_state == GameState.PLAYING else GameState.PAUSED
+                elif event.key == self.cfg.controls.toggle_profiler:
+                    self.show_profiler = not self.show_profiler
                 elif event.key == key_reset:
-                    # Ensure dragged object is released on reset
-                    if self.dragged_object:
-                        self.dragged_object.stop_drag()
-                        self.dragged_object = None
-                    self.load_current_level()
+                    self.reset_level()
         return True
 
     def handle_mallet_use(self, mouse_pos):
@@ -119,7 +276,7 @@ class GameController:
 
         if closest_obj:
             # Apply mallet hit force (optional)
-            hit_force = self.settings.get("game", "mallet_hit_force", default=5)
+            hit_force = self.settings.get("game", "mallet_hit_force", default=10)
             if hit_force > 0 and closest_obj != self.player:
                  direction_x = closest_obj.rect.centerx - self.player.rect.centerx
                  direction_y = closest_obj.rect.centery - self.player.rect.centery
@@ -130,38 +287,150 @@ class GameController:
                      
             # Apply/Remove modifier
             self.player.use_mallet(closest_obj)
+            if closest_obj != self.player:
+                self.wake_island(closest_obj)
+
+    def wake_island(self, obj: GameObject):
+        """Wake an object and every sleeping object in contact with it, transitively."""
+        pending = [obj]
+        if obj.sleeping:
+            self.woken_objects.append(obj)
+        obj.wake()
+        while pending:
+            current = pending.pop()
+            # Resting contacts only touch, so look one pixel beyond the rect
+            for other in self.dynamic_broadphase.query(current.rect.inflate(2, 2)):
+                if other.sleeping:
+                    other.wake()
+                    self.woken_objects.append(other)
+                    pending.append(other)
+
+    def _resolve_player_contacts(self):
+        """Resolve the player against the dynamic objects it overlaps, in level order."""
+        player = self.player
+        broadphase = self.dynamic_broadphase
+        contacts = broadphase.query(player.rect)
+        while contacts:
+            obj = contacts.pop(0)
+            # Skip physics interaction if this object is being dragged
+            if obj == self.dragged_object:
+                continue
+            position = player.rect.topleft
+            self._resolve_contact(player, obj)
+            if self.physics_world is not None:
+                self.physics_world.refresh_body(obj)
+            if player.rect.topleft != position:
+                # Pushed out: look again for overlaps further along the level order
+                rank = broadphase.rank(obj)
+                contacts = [other for other in broadphase.query(player.rect) if broadphase.rank(other) > rank]
+
+    def _resolve_contact(self, body: GameObject, other: GameObject):
+        """Resolve a contact, waking a sleeping participant only if it gets disturbed."""
+        sleeper = other if other.sleeping else body if body.sleeping else None
+        if sleeper is None:
+            self.physics.handle_player_object_collision(body, other)
+            return
+        position = sleeper.rect.topleft
+        self.physics.handle_player_object_collision(body, other)
+        threshold = self.sleep_velocity_threshold
+        if (sleeper.rect.topleft != position or abs(sleeper.velocity_x) >= threshold
+                or abs(sleeper.velocity_y) >= threshold):
+            self.wake_island(sleeper)
+        else:
+            # A gentle resting contact: stay asleep
+            sleeper.velocity_x = 0
+            sleeper.velocity_y = 0
+
+    def step(self):
+        """Advance the simulation by one fixed tick."""
+        self.player.store_render_state()
+        for obj in self.dynamic_objects:
+            obj.store_render_state()
+        self.camera.store_render_state()
+        self.input.begin_tick(self.tick)
+        self.update()
+        self.camera.follow(self.player.rect)
+        self.tick += 1
+        for listener in self.tick_listeners:
+            listener(self)
 
     def update(self):
         if self.game_state != GameState.PLAYING:
             return
 
+        self.physics.reset_frame_stats()
+        profiler = self.profiler
+        t = time.perf_counter()
+
         # Update player
         self.player.update()
-        handle_collisions(self.player, self.static_objects)
+        t = profiler.lap("player", t)
+        self.physics.handle_collisions(self.player, self.static_objects, self.static_index)
+        t = profiler.lap("static", t)
         # Handle player collision with dynamic objects AFTER static collisions
-        for obj in self.dynamic_objects:
-             # Skip physics interaction if this object is being dragged
-             if obj != self.dragged_object:
-                 self.physics.handle_player_object_collision(self.player, obj)
-        keep_in_bounds(self.player)
+        self._resolve_player_contacts()
+        t = profiler.lap("pairs", t)
+        self.physics.keep_in_bounds(self.player)
+        t = profiler.lap("bounds", t)
 
-        # Update dynamic objects
-        for obj in self.dynamic_objects:
-            # Only update physics if not being dragged
-            if not obj.being_dragged:
+        # Update dynamic objects; sleeping ones stay where they are
+        awake = [obj for obj in self.dynamic_objects if not obj.sleeping]
+        if self.physics_world is not None:
+            # Integrate every non-dragged object in one batch
+            self.physics_world.integrate(awake)
+        for obj in awake:
+            # Dragged objects follow the mouse (handled in GameObject.update)
+            # Optional: Keep dragged object partially within bounds?
+            # keep_in_bounds(obj) # Might feel weird, maybe allow dragging slightly out?
+            if obj.being_dragged or self.physics_world is None:
                 obj.update()
-                handle_collisions(obj, self.static_objects)
-                # Handle interactions between dynamic objects
-                for other_obj in self.dynamic_objects:
-                    # Skip interaction if either object is being dragged
-                    if obj != other_obj and obj != self.dragged_object and other_obj != self.dragged_object:
-                        self.physics.handle_player_object_collision(obj, other_obj)
-                keep_in_bounds(obj)
-            else:
-                # If dragged, just update position based on mouse (handled in GameObject.update)
-                obj.update() 
-                # Optional: Keep dragged object partially within bounds?
-                # keep_in_bounds(obj) # Might feel weird, maybe allow dragging slightly out?
+        t = profiler.lap("integrate", t)
+        if self.physics_world is not None:
+            self.physics_world.handle_collisions(self.physics, self.static_objects)
+            # The broadphase and contacts below work on the objects' rects
+            self.physics_world.write_positions()
+        else:
+            for obj in awake:
+                # Only collide if not being dragged
+                if not obj.being_dragged:
+                    self.physics.handle_collisions(obj, self.static_objects, self.static_index)
+        t = profiler.lap("static", t)
+
+        # Handle interactions between dynamic objects, once per overlapping pair
+        self.dynamic_broadphase.update(awake)
+        self.woken_objects.clear()
+        pairs = self.dynamic_broadphase.find_pairs(awake)
+        if self.physics_world is not None and pairs:
+            touched = list({id(obj): obj for pair in pairs for obj in pair}.values())
+            self.physics_world.write_bodies(touched)
+        for obj, other_obj in pairs:
+            # Skip interaction if either object is being dragged
+            if obj != self.dragged_object and other_obj != self.dragged_object:
+                self._resolve_contact(obj, other_obj)
+        if self.physics_world is not None and pairs:
+            self.physics_world.read_bodies(touched)
+        t = profiler.lap("pairs", t)
+        # Contacts may have woken objects
+        awake.extend(self.woken_objects)
+
+        if self.physics_world is not None:
+            self.physics_world.keep_in_bounds(awake)
+            # Sleep checks and everything after the tick read the objects
+            self.physics_world.push()
+        else:
+            for obj in awake:
+                if not obj.being_dragged:
+                    self.physics.keep_in_bounds(obj)
+        t = profiler.lap("bounds", t)
+
+        if self.sleep_enabled:
+            for obj in awake:
+                if not obj.being_dragged:
+                    obj.update_sleep(self.sleep_velocity_threshold, self.sleep_frames)
+        profiler.lap("sleep", t)
+        # Bounds moved objects since the pair pass; queries between ticks
+        # (culling, wake_island) bisect on these edges
+        self.dynamic_broadphase.update(awake)
 
         # Check if player reached the goal
         if self.goal and self.player.collides_with(self.goal):
@@ -172,66 +441,417 @@ class GameController:
                 self.game_state = GameState.GAME_OVER
 
     def show_victory_message(self):
-        font = pygame.font.Font(None, 74)
+        if self.headless:
+            return
         if self.level_manager.current_level >= self.level_manager.get_level_count() - 1:
-            text = font.render('Game Complete!', True, (255, 215, 0))
+            message = 'Game Complete!'
         else:
-            text = font.render('Level Complete!', True, (255, 215, 0))
-        text_rect = text.get_rect(center=(self.settings.get("window", "width")/2, self.settings.get("window", "height")/2))
-        self.screen.blit(text, text_rect)
+            message = 'Level Complete!'
+        if threading.current_thread() is self._simulation_thread:
+            # The render thread owns the window: hand it the message and pause
+            self.message = message
+            self._publish_snapshot(time.perf_counter())
+            time.sleep(2.0)
+            self.message = None
+            return
+        self._draw_message(message)
         pygame.display.flip()
+        self._full_redraw = True
         pygame.time.wait(2000)
 
-    def draw(self):
-        # Fill background
-        self.screen.fill(tuple(self.settings.get("colors", "background", default=[0, 0, 0])))
+    def _draw_message(self, message: str):
+        text = text_renderer.render(message, 74, (255, 215, 0))
+        text_rect = text.get_rect(center=(self.settings.get("window", "width")/2, self.settings.get("window", "height")/2))
+        self.screen.blit(text, text_rect)
 
-        # Draw game objects
-        for obj in self.static_objects:
-            obj.draw(self.screen)
+    def _render_rect(self, obj: GameObject, alpha: float) -> pygame.Rect:
+        """Where to draw an object on screen, between its previous and current step positions."""
+        rect = obj.rect
+        ox, oy = self._view_offset
+        if alpha >= 1.0:
+            return rect.move(-ox, -oy) if ox or oy else rect
+        x, y = obj.get_render_position(alpha)
+        return rect.move(round(x) - rect.x - ox, round(y) - rect.y - oy)
 
-        for obj in self.dynamic_objects:
+    def _draw_at(self, obj: GameObject, render_rect: pygame.Rect):
+        """Draw an object as if its rect were render_rect."""
+        rect = obj.rect
+        obj.rect = render_rect
+        try:
             obj.draw(self.screen)
+        finally:
+            obj.rect = rect
 
-        if self.goal:
-            self.goal.draw(self.screen)
+    def _draw_interpolated(self, obj: GameObject, alpha: float):
+        """Draw an object between its previous and current step positions."""
+        self._draw_at(obj, self._render_rect(obj, alpha))
 
-        self.player.draw(self.screen)
+    def _draw_object(self, obj: GameObject, render_rect: pygame.Rect):
+        """Queue a dynamic object for the batch, or draw it directly if it draws itself."""
+        if self.batch_rendering and type(obj).draw is GameObject.draw:
+            self.batch.add(self.screen, obj, render_rect)
+        else:
+            # Keep painter's order: earlier queued objects go first
+            self.batch.flush(self.screen)
+            self._draw_at(obj, render_rect)
+            self.batch.draw_calls += 1
+
+    @staticmethod
+    def _draw_key(obj: GameObject) -> int:
+        """Identity of the drawn object, the same for a live object and its snapshots."""
+        return getattr(obj, "source_id", None) or id(obj)
+
+    def draw(self, alpha: float = 1.0):
+        """Draw the live game state."""
+        t = time.perf_counter()
+        scene = RenderSnapshot.capture(self, copy=False)
+        self.profiler.lap("snapshot", t)
+        self.draw_snapshot(scene, alpha)
+
+    def draw_snapshot(self, scene: RenderSnapshot, alpha: float = 1.0):
+        """Draw a captured frame, interpolated by alpha between its last two steps."""
+        t = time.perf_counter()
+        if self._clear_render_caches:
+            # Requested by a settings change, possibly from the simulation thread
+            self._clear_render_caches = False
+            self.batch.atlas.clear()
+        self.batch.draw_calls = 0
+        prev_x, prev_y, x, y = scene.camera
+        self._view_offset = (round(prev_x + (x - prev_x) * alpha), round(prev_y + (y - prev_y) * alpha))
+        # A scrolled view moves everything, so dirty rects only help while it stands still
+        if (self.dirty_rects and not self._full_redraw and scene.message is None and
+                self._view_offset == self._drawn_offset):
+            rects = self._draw_dirty(scene, alpha)
+            t = self.profiler.lap("draw", t)
+            pygame.display.update(rects)
+        else:
+            self._draw_full(scene, alpha)
+            t = self.profiler.lap("draw", t)
+            pygame.display.flip()
+        self.profiler.lap("flip", t)
+
+    def _draw_full(self, scene: RenderSnapshot, alpha: float):
+        self._full_redraw = False
+        self._drawn_offset = self._view_offset
+
+        # Background, platforms and goal from the pre-rendered chunks in view
+        scene.static_layer.draw(self.screen, self._view_offset)
+
+        for obj in scene.objects:
+            self._draw_object(obj, self._render_rect(obj, alpha))
+        self.batch.flush(self.screen)
+
+        self._draw_interpolated(scene.player, alpha)
+        self.draw_calls = self.batch.draw_calls + 1
+        self._hud_rects = self._draw_hud(scene)
+        if scene.message is not None:
+            self._draw_message(scene.message)
+            # Repaint everything once the message is gone
+            self._full_redraw = True
+        elif self.dirty_rects:
+            self._remember_drawn_areas(scene, alpha)
+
+    def _remember_drawn_areas(self, scene: RenderSnapshot, alpha: float):
+        self._drawn_areas = {}
+        for obj in scene.objects:
+            bounds = obj.get_draw_bounds(self._render_rect(obj, alpha))
+            self._drawn_areas[self._draw_key(obj)] = (bounds, self._appearance(obj, bounds))
+        player = scene.player
+        self._drawn_areas[self._draw_key(player)] = (player.get_draw_bounds(self._render_rect(player, alpha)), None)
+        if player.hud_rect:
+            self._hud_rects.append(player.hud_rect)
+
+    @staticmethod
+    def _appearance(obj: GameObject, bounds: pygame.Rect) -> Optional[tuple]:
+        """Everything that changes how an object looks; None if it animates every frame."""
+        modifiers = tuple(modifier.effect_type for modifier in obj.active_modifiers)
+        if "floaty" in modifiers:
+            return None
+        return (bounds.x, bounds.y, bounds.w, bounds.h, obj.color, modifiers)
+
+    def _draw_dirty(self, scene: RenderSnapshot, alpha: float) -> List[pygame.Rect]:
+        """Redraw only the areas that changed since the last frame; return the areas to update."""
+        screen = self.screen
+        previous = self._drawn_areas
+        current = {}
+        # Last frame's HUD is always erased and redrawn
+        dirty = list(self._hud_rects)
+
+        entries = []
+        for obj in scene.objects:
+            render_rect = self._render_rect(obj, alpha)
+            bounds = obj.get_draw_bounds(render_rect)
+            appearance = self._appearance(obj, bounds)
+            key = self._draw_key(obj)
+            old = previous.get(key)
+            if old is None or appearance is None or old[1] != appearance:
+                if old is not None:
+                    dirty.append(old[0])
+                dirty.append(bounds)
+            current[key] = (bounds, appearance)
+            entries.append((obj, render_rect, bounds))
+
+        # The player animates and carries the HUD label, so it is always redrawn
+        player = scene.player
+        player_rect = self._render_rect(player, alpha)
+        player_bounds = player.get_draw_bounds(player_rect)
+        key = self._draw_key(player)
+        old = previous.get(key)
+        if old is not None:
+            dirty.append(old[0])
+        dirty.append(player_bounds)
+        current[key] = (player_bounds, None)
+        for key in previous.keys() - current.keys():
+            dirty.append(previous[key][0])
+
+        # Objects overlapping an erased area must be redrawn, and redrawing one
+        # paints its whole bounds, so grow the dirty set until it is closed
+        redraw = [False] * len(entries)
+        grown = True
+        while grown:
+            grown = False
+            for i, (obj, render_rect, bounds) in enumerate(entries):
+                if not redraw[i] and bounds.collidelist(dirty) != -1:
+                    redraw[i] = True
+                    dirty.append(bounds)
+                    grown = True
+
+        # Erase back to the static level
+        static_layer = scene.static_layer
+        for rect in dirty:
+            static_layer.restore(screen, rect, self._view_offset)
+        for i, (obj, render_rect, bounds) in enumerate(entries):
+            if redraw[i]:
+                self._draw_object(obj, render_rect)
+        self.batch.flush(screen)
+        self._draw_at(player, player_rect)
+        self.draw_calls = self.batch.draw_calls + 1
+
+        hud_rects = self._draw_hud(scene)
+        if player.hud_rect:
+            hud_rects.append(player.hud_rect)
+        self._hud_rects = hud_rects
+        self._drawn_areas = current
+        return dirty + hud_rects
+
+    def _draw_hud(self, scene: RenderSnapshot) -> List[pygame.Rect]:
+        """Draw level text and debug overlays; return the areas drawn."""
+        cfg = self.cfg
+        rects = []
 
         # Draw level information
-        if self.current_level_data:
-            font_size = self.settings.get("ui", "font_size_normal", default=24)
-            small_font_size = self.settings.get("ui", "font_size_hint", default=18)
-            
-            font = pygame.font.Font(None, font_size)
-            small_font = pygame.font.Font(None, small_font_size)
-            text_color = tuple(self.settings.get("colors", "ui_text", default=[255, 255, 255]))
+        if scene.level_title is not None:
+            font_size = cfg.ui.font_size_normal
+            small_font_size = cfg.ui.font_size_hint
+            text_color = cfg.colors.ui_text
             
             # Level name
-            name_text = font.render(
-                f"Level {self.level_manager.current_level + 1}: {self.current_level_data['name']}", 
-                True, text_color
-            )
-            self.screen.blit(name_text, (10, 10))
+            name_text = text_renderer.render(scene.level_title, font_size, text_color)
+            rects.append(self.screen.blit(name_text, (10, 10)))
             
             # Level hints
-            for i, hint in enumerate(self.current_level_data.get("hints", [])):
-                hint_text = small_font.render(hint, True, text_color)
-                self.screen.blit(hint_text, (10, 50 + i * 25))
+            for i, hint in enumerate(scene.hints):
+                hint_text = text_renderer.render(hint, small_font_size, text_color)
+                rects.append(self.screen.blit(hint_text, (10, 50 + i * 25)))
 
         # Draw FPS counter if enabled
-        if self.settings.get("debug", "show_fps", default=False):
+        if cfg.debug.show_fps:
             fps = self.clock.get_fps()
-            fps_text = self.fps_font.render(f"FPS: {int(fps)}", True, (255, 255, 0))
-            self.screen.blit(fps_text, (10, self.settings.get("window", "height") - 40))
+            fps_text = text_renderer.render(f"FPS: {int(fps)}", 36, (255, 255, 0))
+            rects.append(self.screen.blit(fps_text, (10, cfg.window.height - 40)))
 
-        pygame.display.flip()
+        # Draw broadphase statistics if enabled
+        if scene.stats is not None:
+            stats_text = text_renderer.render(f"{scene.stats} Draw calls: {self.draw_calls}",
+                                              36, (255, 255, 0), cache=False)
+            rects.append(self.screen.blit(stats_text, (10, cfg.window.height - 70)))
+
+        # Draw simulation/render timings if enabled
+        if cfg.debug.show_timings:
+            timings_text = text_renderer.render(self.profiler.summary(self.threaded), 24, (255, 255, 0),
+                                                cache=False)
+            rects.append(self.screen.blit(timings_text, (10, cfg.window.height - 95)))
+
+        if self.show_profiler:
+            rects.append(self.profiler_overlay.draw(self.screen, self.profiler))
+        return rects
+
+    def _poll_config(self, current_time: float, next_poll: float) -> float:
+        """Hot-reload config.json when due; return the time of the next check."""
+        poll_interval = self.cfg.game.config_poll_interval
+        if poll_interval > 0 and current_time >= next_poll:
+            self.settings.reload_if_changed()
+            return current_time + poll_interval
+        return next_poll
+
+    def _advance(self, accumulator: float) -> float:
+        """Run the fixed steps that accumulated time allows; return the leftover time."""
+        step_time = self.step_time
+        max_steps = self.cfg.physics.max_catchup_steps
+        steps = 0
+        while accumulator >= step_time and steps < max_steps:
+            self.step()
+            accumulator -= step_time
+            steps += 1
+        if accumulator >= step_time:
+            # Too far behind (hitch or slow machine): drop the backlog
+            # instead of spiralling into ever longer catch-up frames
+            accumulator %= step_time
+        return accumulator
 
     def run(self):
+        # Read once per run; switching modes needs a restart of the loop
+        self.threaded = self.cfg.window.threaded_simulation
+        if self.threaded:
+            self._run_threaded()
+        else:
+            self._run_serial()
+        self._dump_profile()
+        pygame.quit()
+
+    def _dump_profile(self):
+        if not self.profile_dump:
+            return
+        try:
+            self.profiler.dump(self.profile_dump)
+            print(f"Wrote {self.profiler.count} frames of profiler timings to {self.profile_dump}")
+        except OSError as e:
+            print(f"Warning: Could not write profiler timings to {self.profile_dump}: {e}")
+
+    def _run_serial(self):
+        # Simulate at a fixed rate and render as often as the display allows
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        next_config_poll = previous_time
+
         running = True
         while running:
+            current_time = time.perf_counter()
+            accumulator += current_time - previous_time
+            previous_time = current_time
+
+            # Hot-reload config.json; settings are re-read below so edits apply this frame
+            next_config_poll = self._poll_config(current_time, next_config_poll)
+
+            t = time.perf_counter()
+            running = self.handle_events()
+            self.profiler.lap("events", t)
+            accumulator = self._advance(accumulator)
+
+            self.draw(accumulator / self.step_time)
+            self.profiler.end_frame()
+            self.clock.tick(self.cfg.window.fps)
+
+    def _queue_live_input(self) -> Tuple[Optional[InputSource], Optional[QueuedInputSource]]:
+        """Put a queue in front of the pygame input source so the main thread can poll it.
+
+        Sources wrapping it (e.g. a recorder) keep running on the simulation
+        thread. Returns the wrapper that holds the queue (None if the game
+        input itself was replaced) and the queue, or None if nothing reads pygame.
+        """
+        holder, source = None, self.input
+        while not isinstance(source, PygameInputSource):
+            holder, source = source, getattr(source, "inner", None)
+            if source is None:
+                return None, None
+        queued = QueuedInputSource(source)
+        if holder is None:
+            self.set_input_source(queued)
+        else:
+            holder.inner = queued
+        return holder, queued
+
+    def _publish_snapshot(self, due_time: float):
+        t = time.perf_counter()
+        self.snapshots.publish(RenderSnapshot.capture(self, due_time))
+        self.profiler.lap("snapshot", t)
+
+    def _simulate(self):
+        """Simulation thread: step at the fixed rate and publish a snapshot after each batch."""
+        try:
+            accumulator = 0.0
+            previous_time = time.perf_counter()
+            next_config_poll = previous_time
+            while self._sim_running:
+                current_time = time.perf_counter()
+                accumulator += current_time - previous_time
+                previous_time = current_time
+
+                next_config_poll = self._poll_config(current_time, next_config_poll)
+                running = self.handle_events()
+                self.profiler.lap("events", current_time)
+                if not running:
+                    break
+                tick = self.tick
+                accumulator = self._advance(accumulator)
+                if self.tick != tick:
+                    self._publish_snapshot(current_time - accumulator)
+                # Sleep until the next tick is due; input waits at most one step
+                time.sleep(max(0.0, self.step_time - accumulator))
+        except Exception as e:
+            self._sim_error = e
+        finally:
+            self._sim_running = False
+
+    def _run_threaded(self):
+        """Render on this thread while a worker thread simulates the next frames.
+
+        Input is still polled here, as pygame requires, and queued for the
+        simulation. Frames are drawn from immutable snapshots, so drawing
+        never waits for the simulation and never sees a half-updated world.
+        """
+        holder, queued = self._queue_live_input()
+        self.snapshots = SnapshotBuffer(RenderSnapshot.capture(self, time.perf_counter()))
+        self._sim_error = None
+        self._sim_running = True
+        worker = threading.Thread(target=self._simulate, name="simulation", daemon=True)
+        self._simulation_thread = worker
+        worker.start()
+        try:
+            while self._sim_running:
+                if queued is not None:
+                    queued.pump()
+                else:
+                    pygame.event.pump()
+                scene = self.snapshots.latest()
+                alpha = min(1.0, max(0.0, (time.perf_counter() - scene.due_time) / self.step_time))
+                self.draw_snapshot(scene, alpha)
+                self.profiler.end_frame()
+                self.clock.tick(self.cfg.window.fps)
+        finally:
+            self._sim_running = False
+            worker.join()
+            self._simulation_thread = None
+            if queued is not None:
+                if holder is None:
+                    self.set_input_source(queued.inner)
+                else:
+                    holder.inner = queued.inner
+        if self._sim_error is not None:
+            raise self._sim_error
+
+    def run_headless(self, max_ticks: Optional[int] = None) -> dict:
+        """Simulate as fast as possible without drawing.
+
+        Stops after max_ticks steps, on a quit event, or when the game ends.
+        Returns the number of ticks, elapsed seconds and ticks per second.
+        """
+        start_tick = self.tick
+        start_time = time.perf_counter()
+        running = True
+        while running and self.game_state != GameState.GAME_OVER:
+            if max_ticks is not None and self.tick - start_tick >= max_ticks:
+                break
+            t = time.perf_counter()
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(self.settings.get("window", "fps", default=60))
-        pygame.quit()
\ No newline at end of file
+            self.profiler.lap("events", t)
+            if running:
+                self.step()
+                # Without rendering, every tick is a profiler frame
+                self.profiler.end_frame()
+        elapsed = time.perf_counter() - start_time
+        ticks = self.tick - start_tick
+        ticks_per_second = ticks / elapsed if elapsed > 0 else float('inf')
+        print(f"Simulated {ticks} ticks in {elapsed:.2f}s ({ticks_per_second:.0f} ticks/s)")
+        self._dump_profile()
+        return {"ticks": ticks, "seconds": elapsed, "ticks_per_second": ticks_per_second}
\ No newline at end of file
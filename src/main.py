@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 import pygame
@@ -7,17 +8,73 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from src.controllers.game_controller import GameController
+from src.utils.input_source import PygameInputSource
+from src.utils.replay import load_recording, replay, start_recording
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Modifier Mallet")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a window as fast as possible")
+    parser.add_argument("--ticks", type=int, default=3600,
+                        help="number of simulation ticks to run in headless mode")
+    parser.add_argument("--level", type=int, default=None,
+                        help="level index to start on")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record all input and per-tick world hashes to FILE")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a recording at uncapped speed, stopping at the first divergence")
+    parser.add_argument("--until", type=int, default=None,
+                        help="with --replay: fast-forward to this tick, then continue playing live")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="write per-phase frame timings to FILE (.csv or .jsonl) on exit")
+    return parser.parse_args()
+
+def run_replay(game, args):
+    recording = load_recording(args.replay)
+    result = replay(game, recording, until_tick=args.until)
+    print(f"Replayed {result['ticks']} ticks in {result['seconds']:.2f}s "
+          f"({result['ticks_per_second']:.0f} ticks/s)")
+    if result["diverged_at"] is not None:
+        print(f"Diverged at tick {result['diverged_at']}: "
+              f"expected {result['expected_hash']:08x}, got {result['actual_hash']:08x}")
+    elif not game.headless and args.until is not None:
+        # Hand over to the player at the requested frame
+        game.set_input_source(PygameInputSource())
+        game.run()
 
 def main():
+    args = parse_args()
+    if args.headless:
+        # No window is opened, but keep SDL from looking for a display at all
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
     # Initialize pygame before creating the game controller
     pygame.init()
     
+    recorder = None
     try:
-        game = GameController()
-        game.run()
+        game = GameController(headless=args.headless)
+        if args.replay:
+            run_replay(game, args)
+            return
+        if args.level is not None:
+            game.level_manager.current_level = args.level
+            game.load_current_level()
+        if args.profile:
+            game.profile_dump = args.profile
+        if args.record:
+            recorder = start_recording(game)
+        if args.headless:
+            game.run_headless(args.ticks)
+        else:
+            game.run()
     except Exception as e:
         print(f"Error running game: {e}")
     finally:
+        if recorder is not None:
+            recorder.save(args.record, game.settings)
+            print(f"Saved recording to {args.record}")
         pygame.quit()
 
 if __name__ == "__main__":
@@ -1,31 +1,45 @@
 import pygame
 from typing import Tuple, Optional
 from src.utils.constants import *
-from src.utils.settings_manager import SettingsManager
+from src.utils.input_source import InputSource, pygame_input
+from src.utils.settings_manager import SettingsManager, SettingsView, path_changed
+from src.views.overlay_cache import overlay_cache
 
 class GameObject:
     def __init__(self, x: float, y: float, width: int, height: int, color: Tuple[int, int, int] = WHITE, mass: float = None):
         self.settings = SettingsManager()
+        # Compiled settings for per-frame reads
+        self.cfg = self.settings.compiled
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
         self.original_color = color
         self.velocity_x = 0
         self.velocity_y = 0
         self.mass = mass if mass is not None else self.settings.get("physics", "object", "default_mass", default=1.0)
-        self.gravity = self.settings.get("physics", "gravity", default=0.8)
-        self.friction = self.settings.get("physics", "object", "default_friction", default=0.5)
+        self.gravity = self.settings.get("physics", "gravity", default=1.6)
+        self.friction = self.settings.get("physics", "object", "default_friction", default=1.0)
         self.elasticity = self.settings.get("physics", "object", "default_elasticity", default=0.2)
         self.on_ground = False
         self.active_modifiers = []
         self.prev_x = x
         self.prev_y = y
+        # Position at the start of the current simulation step, for render interpolation
+        self.render_prev_x = self.rect.x
+        self.render_prev_y = self.rect.y
         self.is_pushable = True
         self.is_draggable = False
         self.being_dragged = False
         self.drag_offset_x = 0
         self.drag_offset_y = 0
         self.is_ghost_passable = False  # New property to mark objects that can be passed through when ghostly
+        self.input_source: InputSource = pygame_input  # Where drag positions are read from
         self.collision_enabled = True
+        # Resting objects are put to sleep and skip physics until woken
+        self.sleeping = False
+        self.sleep_timer = 0
+        # Set when a PhysicsWorld integrates this object in batch
+        self.physics_world = None
+        self.world_index = -1
 
     def update(self):
         # Store previous position
@@ -34,7 +48,7 @@ class GameObject:
 
         if self.being_dragged:
             # Follow mouse position when being dragged
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.input_source.get_mouse_pos()
             self.rect.x = mouse_x - self.drag_offset_x
             self.rect.y = mouse_y - self.drag_offset_y
             self.velocity_x = 0
@@ -49,27 +63,49 @@ class GameObject:
                 friction_force = self.friction * (1 if self.velocity_x > 0 else -1)
                 self.velocity_x = max(0, abs(self.velocity_x) - friction_force) * (1 if self.velocity_x > 0 else -1)
 
-            # Update position one axis at a time to prevent tunneling
+            # Move by the whole step; PhysicsSystem.handle_collisions sweeps
+            # this displacement against static geometry from prev_x/prev_y
             self.rect.x += self.velocity_x
-            
-            # Update y position with smaller steps if moving fast
-            remaining_y = self.velocity_y
-            step_size = 4  # Maximum pixels per step
-            
-            while abs(remaining_y) > 0:
-                step = max(-step_size, min(step_size, remaining_y))
-                self.rect.y += step
-                remaining_y -= step
-
-                # Break early if we hit something
-                if self.on_ground and self.velocity_y > 0:
-                    break
+            self.rect.y += self.velocity_y
 
         # Limit vertical speed
-        max_speed = self.settings.get("physics", "player", "max_speed", default=20)
+        max_speed = self.cfg.physics.player.max_speed
         if self.velocity_y > max_speed:
             self.velocity_y = max_speed
 
+    def update_sleep(self, velocity_threshold: float, frames: int):
+        """Count still frames and fall asleep after enough of them."""
+        if abs(self.velocity_x) < velocity_threshold and abs(self.velocity_y) < velocity_threshold:
+            self.sleep_timer += 1
+            if self.sleep_timer >= frames:
+                self.sleeping = True
+                self.velocity_x = 0
+                self.velocity_y = 0
+        else:
+            self.sleep_timer = 0
+
+    def wake(self):
+        """Resume physics updates for a sleeping object."""
+        self.sleeping = False
+        self.sleep_timer = 0
+        # Whatever woke it may also have pushed it
+        self._sync_physics_world()
+
+    def store_render_state(self):
+        """Remember the current position before a simulation step."""
+        self.render_prev_x = self.rect.x
+        self.render_prev_y = self.rect.y
+
+    def get_render_position(self, alpha: float) -> Tuple[float, float]:
+        """Interpolate between the previous and current step positions."""
+        return (self.render_prev_x + (self.rect.x - self.render_prev_x) * alpha,
+                self.render_prev_y + (self.rect.y - self.render_prev_y) * alpha)
+
+    def get_draw_bounds(self, rect: pygame.Rect) -> pygame.Rect:
+        """Screen area draw() touches when the object is drawn at rect."""
+        # Modifier effects reach a little above and below the body (bounce arrow)
+        return rect.inflate(4, 24)
+
     def revert_x(self):
         """Revert x position after collision."""
         self.rect.x = self.prev_x
@@ -84,7 +120,8 @@ class GameObject:
 
     def draw(self, screen: pygame.Surface):
         # Draw the base object
-        if hasattr(self, 'settings') and self.settings.get("debug", "draw_colliders", default=False):
+        cfg = self.cfg
+        if cfg.debug.draw_colliders:
             # Draw collision box
             pygame.draw.rect(screen, (255, 0, 0), self.rect, 1)
         
@@ -92,12 +129,10 @@ class GameObject:
         
         # Draw modifier effects
         for modifier in self.active_modifiers:
-            effect_color = self.settings.get("colors", "modifiers", modifier.effect_type, 
-                                          default=[255, 255, 255])
-            effect_color = tuple(effect_color)  # Convert list to tuple for pygame
+            effect_color = cfg.colors.modifiers.get(modifier.effect_type, (255, 255, 255))
             
             # Draw outline effect
-            outline_thickness = self.settings.get("ui", "modifier_outline_thickness", default=2)
+            outline_thickness = cfg.ui.modifier_outline_thickness
             pygame.draw.rect(screen, effect_color, self.rect, outline_thickness)
             
             # Draw additional visual effects based on modifier
@@ -118,14 +153,13 @@ class GameObject:
                                     2)
             elif modifier.effect_type == "ghostly":
                 # Draw ghostly transparency effect
-                alpha = self.settings.get("physics", "modifiers", "ghostly_alpha", default=128)
-                s = pygame.Surface((self.rect.width, self.rect.height))
-                s.set_alpha(alpha)
-                s.fill(effect_color)
-                screen.blit(s, self.rect)
+                alpha = cfg.physics.modifiers.ghostly_alpha
+                # Shared surface; only rebuilt when size, color or alpha change
+                overlay = overlay_cache.get("ghostly", self.rect.size, effect_color, alpha)
+                screen.blit(overlay, self.rect)
 
     def add_modifier(self, modifier) -> bool:
-        max_modifiers = self.settings.get("game", "max_active_modifiers", default=3)
+        max_modifiers = self.cfg.game.max_active_modifiers
         if len(self.active_modifiers) < max_modifiers:
             # Remove any existing modifier of the same type
             for existing_mod in self.active_modifiers:
@@ -134,6 +168,7 @@ class GameObject:
                     
             self.active_modifiers.append(modifier)
             modifier.apply(self)
+            self.wake()
             
             # Update object properties based on modifier
             if modifier.effect_type == "sticky":
@@ -141,6 +176,7 @@ class GameObject:
             elif modifier.effect_type == "heavy":
                 self.is_pushable = False
             
+            self._sync_physics_world()
             return True
         return False
 
@@ -148,6 +184,7 @@ class GameObject:
         if modifier in self.active_modifiers:
             self.active_modifiers.remove(modifier)
             modifier.remove(self)
+            self.wake()
             
             # Reset object properties
             if modifier.effect_type == "sticky":
@@ -155,10 +192,34 @@ class GameObject:
                 self.being_dragged = False
             elif modifier.effect_type == "heavy":
                 self.is_pushable = True
+            self._sync_physics_world()
+
+    def apply_settings(self, cfg: SettingsView, changed):
+        """Pick up reloaded settings.
+
+        Physics defaults are only re-read while no modifier is active, since
+        modifiers restore the values they saw when they were applied.
+        """
+        self.cfg = cfg
+        if self.active_modifiers:
+            return
+        if path_changed(changed, "physics", "gravity"):
+            self.gravity = cfg.physics.gravity
+        if path_changed(changed, "physics", "object", "default_friction"):
+            self.friction = cfg.physics.object.default_friction
+        if path_changed(changed, "physics", "object", "default_elasticity"):
+            self.elasticity = cfg.physics.object.default_elasticity
+        self._sync_physics_world()
+
+    def _sync_physics_world(self):
+        """Let the batched physics world re-read this object after it changed outside it."""
+        if self.physics_world is not None:
+            self.physics_world.refresh_body(self)
 
     def start_drag(self, mouse_x: int, mouse_y: int):
         """Start dragging the object from current mouse position."""
         if self.is_draggable:
+            self.wake()
             self.being_dragged = True
             self.drag_offset_x = mouse_x - self.rect.x
             self.drag_offset_y = mouse_y - self.rect.y
@@ -166,6 +227,7 @@ class GameObject:
     def stop_drag(self):
         """Stop dragging the object."""
         self.being_dragged = False
+        self._sync_physics_world()
 
     def collides_with(self, other: 'GameObject') -> bool:
         # Skip collision if either object is ghostly and the other is ghost-passable
@@ -1,16 +1,36 @@
 import json
 import os
+import zlib
 from typing import List, Tuple, Optional
 from src.models.game_object import GameObject
+from src.utils import level_cache
+from src.utils.broadphase import SpatialHash
 from src.utils.settings_manager import SettingsManager
 from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
+# Pixels per tile in JSON levels written by level_converter
+JSON_TILE_SIZE = 32
+
 class LevelManager:
     def __init__(self, levels_dir: str = "src/levels"):
         self.settings = SettingsManager()
         self.levels_dir = os.path.join("src", self.settings.get("game", "level_directory", default="levels"))
         self.current_level = 0
         self.levels = self._load_level_list()
+        # Broadphase index over the static objects of the last loaded level
+        self.static_index: Optional[SpatialHash] = None
+        # Per-cell layout of the last ASCII level, kept for editors and tools
+        # even when static tiles are merged into larger colliders
+        self.tile_grid: List[str] = []
+        self.tile_size: Tuple[int, int] = (0, 0)
+        # Size of the last loaded level in pixels; never smaller than the window
+        self.world_size: Tuple[int, int] = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        # Name, description and hints of the last loaded level
+        self.level_info: dict = {}
+        # Whether the last load_level() came from a compiled level
+        self.loaded_from_cache = False
+        # (path, mtime_ns, size) of the last loaded level source
+        self._source_stamp: Optional[Tuple[str, int, int]] = None
         
         # ASCII level symbols mapping
         self.ascii_map = {
@@ -34,6 +54,58 @@ class LevelManager:
             print(f"Error loading levels: {e}")
             return []
 
+    def build_static_index(self, static_objects: List[GameObject]) -> SpatialHash:
+        """Index static objects once per level load for collision queries."""
+        cell_size = self.settings.get("physics", "broadphase_cell_size", default=64)
+        self.static_index = SpatialHash.from_objects(static_objects, cell_size)
+        return self.static_index
+
+    def _merge_static_tiles(self, lines: List[str], chars: set) -> List[Tuple[int, int, int, int, str]]:
+        """Greedily merge runs of identical tiles into maximal rectangles.
+
+        Returns (column, row, columns, rows, char) tuples in grid units.
+        """
+        used = [[False] * len(line) for line in lines]
+        merged = []
+
+        def free(col: int, row: int, char: str) -> bool:
+            line = lines[row]
+            return col < len(line) and line[col] == char and not used[row][col]
+
+        for y, line in enumerate(lines):
+            for x, char in enumerate(line):
+                if char not in chars or used[y][x]:
+                    continue
+                # Grow right along the row, then grow down while the whole span matches
+                w = 1
+                while free(x + w, y, char):
+                    w += 1
+                h = 1
+                while y + h < len(lines) and all(free(x + i, y + h, char) for i in range(w)):
+                    h += 1
+                for row in range(y, y + h):
+                    for col in range(x, x + w):
+                        used[row][col] = True
+                merged.append((x, y, w, h, char))
+        return merged
+
+    def _fit_world_size(self, objects: List[Optional[GameObject]], width: Optional[int] = None,
+                        height: Optional[int] = None) -> Tuple[int, int]:
+        """Level size: the given size, or else the extent of its objects, and at least the window."""
+        rects = [obj.rect for obj in objects if obj is not None]
+        if width is None:
+            width = max((rect.right for rect in rects), default=0)
+        if height is None:
+            height = max((rect.bottom for rect in rects), default=0)
+        return (max(WINDOW_WIDTH, width), max(WINDOW_HEIGHT, height))
+
+    def iter_tile_cells(self):
+        """Yield (column, row, char) for every non-empty cell of the last ASCII level."""
+        for y, line in enumerate(self.tile_grid):
+            for x, char in enumerate(line):
+                if self.ascii_map.get(char) is not None:
+                    yield x, y, char
+
     def load_ascii_level(self, level_txt: str) -> tuple:
         """Load a level from ASCII text representation."""
         static_objects = []
@@ -45,9 +117,18 @@ class LevelManager:
         height = len(lines)
         width = max(len(line) for line in lines)
         
-        # Calculate grid cell size based on window dimensions
-        cell_width = WINDOW_WIDTH // width
-        cell_height = WINDOW_HEIGHT // height
+        tile_size = self.settings.get("game", "tile_size", default=0)
+        if tile_size > 0:
+            # Fixed tile size: the level is as large as its grid and scrolls
+            cell_width = cell_height = tile_size
+        else:
+            # Stretch the grid to fit the window
+            cell_width = WINDOW_WIDTH // width
+            cell_height = WINDOW_HEIGHT // height
+        self.tile_grid = lines
+        self.tile_size = (cell_width, cell_height)
+        merge_tiles = self.settings.get("game", "merge_static_tiles", default=True)
+        static_chars = set()
         
         # Parse the ASCII grid
         for y, line in enumerate(lines):
@@ -56,6 +137,10 @@ class LevelManager:
                     continue
                     
                 obj_def = self.ascii_map[char]
+                if merge_tiles and obj_def["type"] not in ["player_start", "goal", "box", "blocking_box"]:
+                    # Static tiles are merged into larger colliders below
+                    static_chars.add(char)
+                    continue
                 px = x * cell_width
                 py = y * cell_height
                 
@@ -73,16 +158,88 @@ class LevelManager:
                     if "is_ghost_passable" in obj_def:
                         platform.is_ghost_passable = obj_def["is_ghost_passable"]
                     static_objects.append(platform)
+
+        for x, y, w, h, char in self._merge_static_tiles(lines, static_chars):
+            obj_def = self.ascii_map[char]
+            platform = GameObject(x * cell_width, y * cell_height, w * cell_width, h * cell_height,
+                                  tuple(obj_def["color"]))
+            if "is_ghost_passable" in obj_def:
+                platform.is_ghost_passable = obj_def["is_ghost_passable"]
+            static_objects.append(platform)
         
+        self.world_size = self._fit_world_size([], width * cell_width, height * cell_height)
+        self.build_static_index(static_objects)
         return static_objects, dynamic_objects, player_start, goal
 
+    def _parse_settings_crc(self) -> int:
+        """Checksum of the settings that change what a level file parses to."""
+        key = (self.settings.get("game", "tile_size", default=0),
+               self.settings.get("game", "merge_static_tiles", default=True), WINDOW_WIDTH, WINDOW_HEIGHT)
+        return zlib.crc32(repr(key).encode())
+
     def load_level(self, level_number: int) -> Tuple[List[GameObject], List[GameObject], Optional[GameObject], Optional[GameObject]]:
-        """Load a level by number and return its objects."""
+        """Load a level by number and return its objects.
+
+        A compiled copy of the level is used when it is still current;
+        otherwise the source is parsed and compiled for next time.
+        """
+        self.static_index = None
+        self.world_size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.level_info = {"name": f"Level {level_number + 1}", "description": "", "hints": []}
+        self.loaded_from_cache = False
+        self._source_stamp = None
+        # Level load is the one point where picking up config.json edits is cheap
+        self.settings.reload_if_changed()
         if not self.levels or level_number >= len(self.levels):
             return [], [], None, None
 
         level_path = os.path.join(self.levels_dir, self.levels[level_number])
-        
+        self._source_stamp = self._stamp(level_path)
+        is_ascii = level_path.endswith('.txt')
+        use_cache = self.settings.get("game", "level_cache", default=True)
+        settings_crc = self._parse_settings_crc()
+        if use_cache:
+            compiled = level_cache.load_cached(level_path, settings_crc)
+            if compiled is not None:
+                self.loaded_from_cache = True
+                return self._load_compiled(compiled, is_ascii)
+
+        objects = self._parse_level(level_path, level_number)
+        if objects is None:
+            return [], [], None, None
+        if use_cache:
+            compiled = level_cache.CompiledLevel.from_objects(
+                *objects, self.world_size, self.level_info,
+                self.tile_grid if is_ascii else [], self.tile_size if is_ascii else (0, 0))
+            level_cache.save_cached(level_path, compiled, settings_crc)
+        return objects
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[str, int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def source_changed(self) -> bool:
+        """Whether the last loaded level's file was edited since (one stat call)."""
+        if self._source_stamp is None:
+            return True
+        return self._stamp(self._source_stamp[0]) != self._source_stamp
+
+    def _load_compiled(self, compiled: level_cache.CompiledLevel, is_ascii: bool) -> tuple:
+        static_objects, dynamic_objects, player_start, goal = compiled.build()
+        self.world_size = tuple(compiled.world_size)
+        self.level_info = {key: compiled.info[key] for key in ("name", "description", "hints")}
+        if is_ascii:
+            self.tile_grid = compiled.tile_grid.decode().split('\n')
+            self.tile_size = tuple(compiled.info["tile_size"])
+        self.build_static_index(static_objects)
+        return static_objects, dynamic_objects, player_start, goal
+
+    def _parse_level(self, level_path: str, level_number: int) -> Optional[tuple]:
+        """Parse a level source file; None if it cannot be read."""
         # Check if it's a text file (ASCII level) or JSON
         if level_path.endswith('.txt'):
             try:
@@ -90,7 +247,7 @@ class LevelManager:
                     return self.load_ascii_level(f.read())
             except Exception as e:
                 print(f"Error loading ASCII level {level_number}: {e}")
-                return [], [], None, None
+                return None
                 
         # Default JSON loading
         try:
@@ -98,8 +255,11 @@ class LevelManager:
                 level_data = json.load(f)
         except Exception as e:
             print(f"Error loading level {level_number}: {e}")
-            return [], [], None, None
+            return None
 
+        for key in ("name", "description", "hints"):
+            if key in level_data:
+                self.level_info[key] = level_data[key]
         static_objects = []
         dynamic_objects = []
         player_start = None
@@ -138,6 +298,13 @@ class LevelManager:
             g = level_data['goal']
             goal = GameObject(g['x'], g['y'], 30, 30, (255, 215, 0))  # Gold color
 
+        # Levels may give their size in tiles; otherwise it is taken from their contents
+        tile_size = level_data.get('tile_size', JSON_TILE_SIZE)
+        width, height = level_data.get('width'), level_data.get('height')
+        self.world_size = self._fit_world_size(static_objects + dynamic_objects + [player_start, goal],
+                                               width * tile_size if width is not None else None,
+                                               height * tile_size if height is not None else None)
+        self.build_static_index(static_objects)
         return static_objects, dynamic_objects, player_start, goal
 
     def next_level(self) -> bool:
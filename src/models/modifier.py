@@ -42,7 +42,7 @@ class Modifier:
             self._original_values["friction"] = target.friction
             target.velocity_x = 0
             target.velocity_y = 0
-            target.friction = self.settings.get("physics", "modifiers", "sticky_drag_force", default=10)
+            target.friction = self.settings.get("physics", "modifiers", "sticky_drag_force", default=20)
             target.is_draggable = True
         
         elif self.effect_type == "reversed":
@@ -76,11 +76,11 @@ class Modifier:
             target.mass = self._original_values.get("mass", 
                 self.settings.get("physics", "object", "default_mass", default=1.0))
             target.friction = self._original_values.get("friction",
-                self.settings.get("physics", "object", "default_friction", default=0.5))
+                self.settings.get("physics", "object", "default_friction", default=1.0))
         
         elif self.effect_type == "floaty":
             target.gravity = self._original_values.get("gravity", 
-                self.settings.get("physics", "gravity", default=0.8))
+                self.settings.get("physics", "gravity", default=1.6))
             target.mass = self._original_values.get("mass",
                 self.settings.get("physics", "object", "default_mass", default=1.0))
         
@@ -88,7 +88,7 @@ class Modifier:
             target.velocity_x = self._original_values.get("velocity_x", 0)
             target.velocity_y = self._original_values.get("velocity_y", 0)
             target.friction = self._original_values.get("friction", 
-                self.settings.get("physics", "object", "default_friction", default=0.5))
+                self.settings.get("physics", "object", "default_friction", default=1.0))
             target.is_draggable = False
         
         elif self.effect_type == "reversed":
@@ -1,53 +1,83 @@
 import pygame
 import os
+from typing import Callable, Optional
 from src.models.game_object import GameObject
 from src.models.modifier import Modifier
 from src.models.sprite_manager import SpriteManager
 from src.utils.constants import *
-from src.utils.settings_manager import SettingsManager
+from src.utils.input_source import InputSource
+from src.utils.settings_manager import SettingsManager, SettingsView, path_changed
+from src.views.text_renderer import text_renderer
 
 class Player(GameObject):
-    def __init__(self, x: float, y: float, settings: SettingsManager):
+    def __init__(self, x: float, y: float, settings: SettingsManager,
+                 input_source: Optional[InputSource] = None,
+                 time_source: Optional[Callable[[], float]] = None):
         self.settings = settings
         player_mass = settings.get("physics", "player", "mass", default=1.0)
         super().__init__(x, y, 30, 50, tuple(settings.get("colors", "modifiers", "bouncy", default=[0, 0, 255])), mass=player_mass)
         
         # Load player settings
-        self.speed = settings.get("physics", "player", "max_speed", default=7)
-        self.acceleration = settings.get("physics", "player", "acceleration", default=0.5)
-        self.deceleration = settings.get("physics", "player", "deceleration", default=0.35)
-        self.air_acceleration = settings.get("physics", "player", "air_acceleration", default=0.2)
-        self.jump_force = settings.get("physics", "player", "jump_force", default=-15)
-        self.mallet_range = settings.get("mallet", "range", default=100)
+        self._load_player_settings(settings)
+        if input_source is not None:
+            self.input_source = input_source
+        # Seconds used for cooldowns; the game controller passes simulation time
+        self.get_time = time_source or (lambda: pygame.time.get_ticks() / 1000.0)
         
         self.can_jump = False
         self.facing_right = True
         self.current_modifier_index = 0
         self.modifier_types = ["bouncy", "heavy", "floaty", "sticky", "reversed", "ghostly"]
-        self.last_modifier_use = 0
-        self.last_modifier_cycle = 0  # New variable for cycling cooldown
-        self.modifier_cooldown = settings.get("mallet", "cooldown", default=0.5)
-        self.cycle_cooldown = settings.get("controls", "cycle_cooldown", default=0.15)  # New cooldown for cycling
+        self.last_modifier_use = float('-inf')
+        self.last_modifier_cycle = float('-inf')  # New variable for cycling cooldown
         
         # Animation states
         self.sprite_manager = SpriteManager()
         sprite_path = os.path.join("src", "assets", "images", "image.png")
         self.has_sprites = self.sprite_manager.load_spritesheet(sprite_path, 32, 32)
+        if self.has_sprites:
+            self.sprite_manager.bake(self.rect.size)
         self.state = "idle"
         self.state_changed = False
         self.last_state = "idle"
+        # Area of the modifier label drawn last frame, for dirty-rect updates
+        self.hud_rect: Optional[pygame.Rect] = None
+        # Recompute tuning values when config.json is hot-reloaded
+        self.settings.subscribe(self._on_settings_changed)
+
+    def _load_player_settings(self, settings: SettingsManager):
+        self.speed = settings.get("physics", "player", "max_speed", default=14)
+        self.acceleration = settings.get("physics", "player", "acceleration", default=1.0)
+        self.deceleration = settings.get("physics", "player", "deceleration", default=0.7)
+        self.air_acceleration = settings.get("physics", "player", "air_acceleration", default=0.4)
+        self.jump_force = settings.get("physics", "player", "jump_force", default=-30)
+        self.mallet_range = settings.get("mallet", "range", default=100)
+        self.modifier_cooldown = settings.get("mallet", "cooldown", default=0.5)
+        self.cycle_cooldown = settings.get("controls", "cycle_cooldown", default=0.15)  # New cooldown for cycling
+        # Duration of one fixed simulation step, used to advance animations
+        self.tick_dt = 1.0 / TICK_RATE
+
+    def _on_settings_changed(self, changed):
+        self.apply_settings(self.settings.compiled, changed)
+
+    def apply_settings(self, cfg: SettingsView, changed):
+        super().apply_settings(cfg, changed)
+        if (path_changed(changed, "physics", "player") or path_changed(changed, "mallet") or
+                path_changed(changed, "controls", "cycle_cooldown")):
+            self._load_player_settings(self.settings)
 
     def update(self):
-        current_time = pygame.time.get_ticks() / 1000.0
-        keys = pygame.key.get_pressed()
+        current_time = self.get_time()
+        keys = self.input_source.get_pressed()
         
         # Store previous state for animation changes
         self.last_state = self.state
         
         # Get control keys from settings
-        key_left = self.settings.get("controls", "move_left", default=pygame.K_LEFT)
-        key_right = self.settings.get("controls", "move_right", default=pygame.K_RIGHT)
-        key_jump = self.settings.get("controls", "jump", default=pygame.K_SPACE)
+        controls = self.cfg.controls
+        key_left = controls.move_left
+        key_right = controls.move_right
+        key_jump = controls.jump
         
         # Only allow horizontal movement control if not being knocked back
         if abs(self.velocity_x) < self.speed * 1.5:
@@ -69,7 +99,7 @@ class Player(GameObject):
                 elif self.velocity_x < 0:
                     self.velocity_x = min(0, self.velocity_x + self.deceleration)
                 
-                if abs(self.velocity_x) < 0.1:
+                if abs(self.velocity_x) < 0.2:
                     self.state = "idle"
 
         # Store previous position before physics update
@@ -91,13 +121,13 @@ class Player(GameObject):
         self.rect.y += self.velocity_y
 
         # Limit speeds
-        max_fall_speed = self.settings.get("physics", "player", "max_speed", default=20)
+        max_fall_speed = self.cfg.physics.player.max_speed
         if self.velocity_y > max_fall_speed:
             self.velocity_y = max_fall_speed
 
         # Modifier cycling with cooldown
-        key_next = self.settings.get("controls", "cycle_mod_next", default=pygame.K_e)
-        key_prev = self.settings.get("controls", "cycle_mod_prev", default=pygame.K_q)
+        key_next = controls.cycle_mod_next
+        key_prev = controls.cycle_mod_prev
         
         if (keys[key_next] or keys[key_prev]) and current_time - self.last_modifier_cycle >= self.cycle_cooldown:
             if keys[key_next]:
@@ -109,21 +139,27 @@ class Player(GameObject):
         # Update animation state
         if not self.on_ground:
             self.state = "jump"
-        elif abs(self.velocity_x) < 0.1 and self.on_ground:
+        elif abs(self.velocity_x) < 0.2 and self.on_ground:
             self.state = "idle"
 
         # Only update animation if state changed or in walking/jumping state
         self.state_changed = self.last_state != self.state
         if self.has_sprites:
             if self.state_changed or self.state in ["walk", "jump"]:
-                self.sprite_manager.update_animation(1/FPS, self.state)
+                self.sprite_manager.update_animation(self.tick_dt, self.state)
 
         # Reset jump if on ground
         if self.on_ground:
             self.can_jump = True
 
+    def get_draw_bounds(self, rect: pygame.Rect) -> pygame.Rect:
+        # Includes the mallet range circle, but not the modifier label (see hud_rect)
+        circle = pygame.Rect(0, 0, self.mallet_range * 2 + 2, self.mallet_range * 2 + 2)
+        circle.center = rect.center
+        return super().get_draw_bounds(rect).union(circle)
+
     def use_mallet(self, target_object: GameObject, modifier_type: str = None) -> bool:
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = self.get_time()
 
         # Check cooldown
         if current_time - self.last_modifier_use < self.modifier_cooldown:
@@ -155,19 +191,16 @@ class Player(GameObject):
         return False
 
     def draw(self, screen: pygame.Surface):
+        cfg = self.cfg
         # Draw modifier effect indicators
         for modifier in self.active_modifiers:
-            effect_color = tuple(self.settings.get("colors", "modifiers", modifier.effect_type, 
-                                                 default=[255, 255, 255]))
-            thickness = self.settings.get("ui", "modifier_outline_thickness", default=2)
+            effect_color = cfg.colors.modifiers.get(modifier.effect_type, (255, 255, 255))
+            thickness = cfg.ui.modifier_outline_thickness
             pygame.draw.rect(screen, effect_color, self.rect, thickness)
 
         if self.has_sprites:
-            sprite = self.sprite_manager.get_current_animation_frame(self.state)
+            sprite = self.sprite_manager.get_frame(self.state, self.facing_right)
             if sprite:
-                if not self.facing_right:
-                    sprite = pygame.transform.flip(sprite, True, False)
-                sprite = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
                 screen.blit(sprite, self.rect)
             else:
                 super().draw(screen)
@@ -175,18 +208,17 @@ class Player(GameObject):
             super().draw(screen)
 
         # Draw mallet range indicator
-        range_color = tuple(self.settings.get("colors", "mallet_range", default=[100, 100, 100, 150]))
+        range_color = cfg.colors.mallet_range
         pygame.draw.circle(screen, range_color[:3], 
                          (int(self.rect.centerx), int(self.rect.centery)), 
                          self.mallet_range, 1)
         
         # Draw current modifier type and cooldown with selection highlight
-        font_size = self.settings.get("ui", "font_size_normal", default=24)
-        font = pygame.font.Font(FONT_NAME, font_size)
-        text_color = tuple(self.settings.get("colors", "ui_text", default=[255, 255, 255]))
+        font_size = cfg.ui.font_size_normal
+        text_color = cfg.colors.ui_text
         selected_color = MODIFIER_COLORS.get(self.modifier_types[self.current_modifier_index], WHITE)
         
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = self.get_time()
         cooldown_remaining = max(0, self.modifier_cooldown - (current_time - self.last_modifier_use))
         
         mod_text_str = f"Modifier: {self.modifier_types[self.current_modifier_index]}"
@@ -196,7 +228,8 @@ class Player(GameObject):
             else:
                 mod_text_str += " (Ready!)"
                 
-        text_surface = font.render(mod_text_str, True, text_color)
+        # Cached per string, so only a changing cooldown value is re-rendered
+        text_surface = text_renderer.render(mod_text_str, font_size, text_color, FONT_NAME)
         text_rect = text_surface.get_rect(topleft=(10, 40))
         
         # Draw a background highlight for the selected modifier text
@@ -204,7 +237,8 @@ class Player(GameObject):
         pygame.draw.rect(screen, selected_color, highlight_rect, border_radius=5)
         pygame.draw.rect(screen, BLACK, highlight_rect, width=1, border_radius=5) # Optional outline
         screen.blit(text_surface, text_rect)
+        self.hud_rect = highlight_rect
 
         # Draw debug info if enabled
-        if self.settings.get("debug", "draw_colliders", default=False):
+        if cfg.debug.draw_colliders:
             pygame.draw.rect(screen, (255, 0, 0), self.rect, 1)
\ No newline at end of file
@@ -1,10 +1,20 @@
 import pygame
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+# Frames addressed by (state, frame, facing_right)
+FrameKey = Tuple[str, int, bool]
 
 class SpriteManager:
+    # Shared across instances so every entity using a sheet reuses the same
+    # split sprites and baked frames instead of loading and scaling its own
+    _sheet_cache: Dict[tuple, Dict[str, pygame.Surface]] = {}
+    _baked_cache: Dict[tuple, Dict[FrameKey, pygame.Surface]] = {}
+
     def __init__(self):
         self.sprites = {}
+        self.frames: Dict[FrameKey, pygame.Surface] = {}
+        self._sheet_key = None
         self.current_frame = 0
         self.animation_speed = 0.1  # Base animation speed
         self.animation_timer = 0
@@ -16,6 +26,13 @@ class SpriteManager:
             "jump": 2     # Frames in jump animation
         }
         
+        # Sheet row holding each state's frames
+        self.state_rows = {
+            "idle": 0,
+            "walk": 1,
+            "jump": 2
+        }
+        
         self.state_speeds = {
             "idle": 0.2,  # Slower idle animation
             "walk": 0.1,  # Normal walk speed
@@ -27,9 +44,21 @@ class SpriteManager:
         if not os.path.exists(filepath):
             print(f"Warning: Sprite file {filepath} not found!")
             return False
+
+        # Display-format surfaces can only be made once a window exists
+        converted = pygame.display.get_surface() is not None
+        sheet_key = (filepath, sprite_width, sprite_height, converted)
+        cached = SpriteManager._sheet_cache.get(sheet_key)
+        if cached is not None:
+            self.sprites = cached
+            self._sheet_key = sheet_key
+            return True
             
         try:
-            spritesheet = pygame.image.load(filepath).convert_alpha()
+            spritesheet = pygame.image.load(filepath)
+            # Converting needs a display; headless runs keep the raw image
+            if converted:
+                spritesheet = spritesheet.convert_alpha()
             sheet_width = spritesheet.get_width()
             sheet_height = spritesheet.get_height()
             
@@ -44,12 +73,48 @@ class SpriteManager:
                     y = row * sprite_height
                     sprite = spritesheet.subsurface((x, y, sprite_width, sprite_height))
                     self.sprites[f"{row}_{col}"] = sprite
-                    
+
+            SpriteManager._sheet_cache[sheet_key] = self.sprites
+            self._sheet_key = sheet_key
             return True
         except Exception as e:
             print(f"Error loading spritesheet: {e}")
             return False
         
+    def bake(self, size: Tuple[int, int]):
+        """Pre-render every animation frame at size in both facings.
+
+        Afterwards get_frame hands out ready-to-blit surfaces, so drawing
+        allocates nothing.
+        """
+        bake_key = (self._sheet_key, tuple(size))
+        frames = SpriteManager._baked_cache.get(bake_key)
+        if frames is None:
+            frames = {}
+            converted = pygame.display.get_surface() is not None
+            for state, frame_count in self.state_frame_counts.items():
+                row = self.state_rows.get(state, 0)
+                for frame in range(frame_count):
+                    sprite = self.get_sprite(row, frame)
+                    if sprite is None:
+                        continue
+                    # Flip before scaling, matching the order draw code used before baking
+                    right = pygame.transform.scale(sprite, size)
+                    left = pygame.transform.scale(pygame.transform.flip(sprite, True, False), size)
+                    if converted:
+                        right = right.convert_alpha()
+                        left = left.convert_alpha()
+                    frames[(state, frame, True)] = right
+                    frames[(state, frame, False)] = left
+            if self._sheet_key is not None:
+                SpriteManager._baked_cache[bake_key] = frames
+        self.frames = frames
+
+    def get_frame(self, state: str, facing_right: bool) -> Optional[pygame.Surface]:
+        """Baked surface for the current frame of state, or None if it is missing."""
+        frame = self.current_frame % self.state_frame_counts.get(state, 4)
+        return self.frames.get((state, frame, facing_right))
+
     def get_sprite(self, row: int, col: int) -> Optional[pygame.Surface]:
         """Get a specific sprite from the loaded sprites."""
         key = f"{row}_{col}"
@@ -70,10 +135,6 @@ class SpriteManager:
             
     def get_current_animation_frame(self, state: str) -> Optional[pygame.Surface]:
         """Get the current frame based on animation state."""
-        row = {
-            "idle": 0,
-            "walk": 1,
-            "jump": 2
-        }.get(state, 0)
+        row = self.state_rows.get(state, 0)
         
         return self.get_sprite(row, self.current_frame % self.state_frame_counts.get(state, 4))
\ No newline at end of file
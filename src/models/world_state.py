@@ -0,0 +1,106 @@
+from operator import attrgetter
+from typing import Callable, Dict, List, Tuple
+from src.models.game_object import GameObject
+from src.models.modifier import Modifier
+
+# Everything about a GameObject that changes while a level is played.
+# Tuning read from settings (and kept current by hot reload) is left alone.
+# Positions are kept per object; the rest is mostly the same for every box.
+OBJECT_FIELDS = ("color", "velocity_x", "velocity_y", "mass", "gravity", "friction", "elasticity",
+                 "on_ground", "is_pushable", "is_draggable", "being_dragged", "drag_offset_x", "drag_offset_y",
+                 "is_ghost_passable", "collision_enabled", "sleeping", "sleep_timer")
+PLAYER_FIELDS = OBJECT_FIELDS + ("can_jump", "facing_right", "current_modifier_index", "last_modifier_use",
+                                 "last_modifier_cycle", "state", "state_changed", "last_state")
+# Stands for "no alpha attribute": the ghostly modifier adds one
+_MISSING = object()
+
+# (name, effect_type, values, original values) of an active modifier
+ModifierState = Tuple[str, str, dict, dict]
+
+
+class WorldState:
+    """State of a level's objects as loaded, restored in place on reset.
+
+    Each object keeps its rect and previous positions, its modifiers and
+    a dict of its other fields. Objects that start out alike (most boxes) share one dict, so
+    the snapshot stays small and restoring an object is one dict update
+    plus a rect update. Objects are reused as they are, so nothing is
+    re-parsed, re-created or re-loaded (sprites included).
+    """
+
+    def __init__(self, cfg, objects: List[Tuple[GameObject, Tuple[int, int, int, int], tuple, dict,
+                                                 Tuple[ModifierState, ...]]],
+                 dynamic_objects: List[GameObject], broadphase_order: List[GameObject],
+                 player_frame: Tuple[int, float]):
+        # Settings the objects were created with; a reset after they change reloads instead
+        self.cfg = cfg
+        # Player first, then the dynamic objects
+        self.objects = objects
+        self.dynamic_objects = dynamic_objects
+        # Dynamic objects sorted by the broadphase at load, so reset needs no sort
+        self.broadphase_order = broadphase_order
+        # Sprite animation frame and timer
+        self.player_frame = player_frame
+
+    @classmethod
+    def capture(cls, game) -> "WorldState":
+        def capture_object(obj: GameObject, fields: Tuple[str, ...], read: Callable, shared: Dict[tuple, dict]):
+            values = read(obj)
+            alpha = vars(obj).get("alpha", _MISSING)
+            key = (values, alpha)
+            try:
+                state = shared.get(key)
+            except TypeError:
+                # An unhashable value (e.g. a list color); keep a private copy
+                key = state = None
+            if state is None:
+                state = dict(zip(fields, values))
+                if alpha is not _MISSING:
+                    state["alpha"] = alpha
+                if key is not None:
+                    shared[key] = state
+            modifiers = tuple((modifier.name, modifier.effect_type, dict(modifier.values),
+                               dict(modifier._original_values)) for modifier in obj.active_modifiers)
+            previous = (obj.prev_x, obj.prev_y, obj.render_prev_x, obj.render_prev_y)
+            return obj, tuple(obj.rect), previous, state, modifiers
+
+        player = game.player
+        objects = [capture_object(player, PLAYER_FIELDS, attrgetter(*PLAYER_FIELDS), {})]
+        read = attrgetter(*OBJECT_FIELDS)
+        shared: Dict[tuple, dict] = {}
+        objects.extend(capture_object(obj, OBJECT_FIELDS, read, shared) for obj in game.dynamic_objects)
+        sprites = player.sprite_manager
+        return cls(game.settings.compiled, objects, list(game.dynamic_objects),
+                   list(game.dynamic_broadphase.objects), (sprites.current_frame, sprites.animation_timer))
+
+    def is_current(self, game) -> bool:
+        """Whether restoring still gives what reloading the level would."""
+        return game.settings.compiled is self.cfg and game.player is self.objects[0][0]
+
+    def restore(self, game):
+        """Put the player and dynamic objects back; the caller resets the camera and physics world."""
+        for obj, rect, previous, state, modifiers in self.objects:
+            values = vars(obj)
+            values.update(state)
+            if "alpha" in values and "alpha" not in state:
+                del values["alpha"]
+            obj.rect.update(rect)
+            obj.prev_x, obj.prev_y, obj.render_prev_x, obj.render_prev_y = previous
+            # Emptied in place: allocating a list per object would wake the garbage collector
+            active = obj.active_modifiers
+            active.clear()
+            if modifiers:
+                active.extend(self._modifier(obj, modifier) for modifier in modifiers)
+        player = game.player
+        player.sprite_manager.current_frame, player.sprite_manager.animation_timer = self.player_frame
+        player.hud_rect = None
+        game.dynamic_objects = list(self.dynamic_objects)
+        game.dynamic_broadphase.restore_order(self.broadphase_order)
+
+    @staticmethod
+    def _modifier(target: GameObject, state: ModifierState) -> Modifier:
+        name, effect_type, values, original_values = state
+        modifier = Modifier(name, effect_type, dict(values))
+        modifier.target = target
+        modifier._original_values = dict(original_values)
+        return modifier
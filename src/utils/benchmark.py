@@ -0,0 +1,293 @@
+"""Headless physics and render benchmarks on generated scenes.
+
+Each scene has N boxes, M static tiles and K boxes carrying each modifier
+type the player can apply. For every N the suite times update() alone
+(ticks per second) and draw() into the SDL dummy display (frames per
+second), then writes the results with machine info as JSON.
+
+Run from the project root:
+    python -m src.utils.benchmark [--boxes 10,100,1000] [--output bench.json]
+    python -m src.utils.benchmark --compare baseline.json [--threshold 0.1]
+    python -m src.utils.benchmark --level big.txt [--tile-size 32]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Sequence
+
+# Run without a window; set before pygame is imported anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from src.controllers.game_controller import GameController
+from src.models.game_object import GameObject
+from src.models.modifier import Modifier
+from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from src.utils.input_source import ScriptedInputSource
+
+DEFAULT_BOXES = (10, 50, 100, 500, 1000, 2000, 5000)
+# Scene grid: one object per cell, with this share of cells occupied
+CELL_SIZE = 48
+FILL = 0.25
+BOX_COLOR = (255, 0, 0)
+TILE_COLOR = (0, 255, 0)
+# Metrics where higher is better; a drop beyond the threshold is a regression
+METRICS = ("update_ticks_per_second", "draw_frames_per_second")
+
+
+def build_scene(game: GameController, boxes: int, tiles: int, modifiers: int, seed: int = 0) -> dict:
+    """Replace the running level with a generated one.
+
+    Boxes and tiles are scattered over a grid sized to keep the scene as
+    dense as a hand-made level, so the world grows with N instead of
+    piling thousands of boxes into one screen.
+    """
+    rng = random.Random(seed)
+    cells_needed = int((boxes + tiles + 1) / FILL)
+    columns = max(WINDOW_WIDTH // CELL_SIZE, math.ceil(math.sqrt(cells_needed * 4 / 3)))
+    rows = max(WINDOW_HEIGHT // CELL_SIZE, math.ceil(cells_needed / columns))
+    cells = rng.sample(range(columns * rows), boxes + tiles + 1)
+
+    static_objects = []
+    for cell in cells[:tiles]:
+        column, row = divmod(cell, rows)
+        static_objects.append(GameObject(column * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE // 3,
+                                         TILE_COLOR))
+    dynamic_objects = []
+    for cell in cells[tiles:tiles + boxes]:
+        column, row = divmod(cell, rows)
+        dynamic_objects.append(GameObject(column * CELL_SIZE + rng.randrange(CELL_SIZE - 30),
+                                          row * CELL_SIZE + CELL_SIZE // 3, 30, 30, BOX_COLOR))
+    column, row = divmod(cells[-1], rows)
+    player_start = GameObject(column * CELL_SIZE, row * CELL_SIZE, 30, 50, (0, 0, 255))
+
+    level_manager = game.level_manager
+    level_manager.world_size = level_manager._fit_world_size([], columns * CELL_SIZE, rows * CELL_SIZE)
+    level_manager.build_static_index(static_objects)
+    game.install_level(static_objects, dynamic_objects, player_start, None)
+    game.current_level_data = {"name": f"Benchmark {boxes} boxes", "description": "", "hints": []}
+
+    # Modifiers go to distinct boxes, as many of each type as there are boxes for
+    targets = dynamic_objects[:]
+    rng.shuffle(targets)
+    applied = 0
+    for modifier_type in game.player.modifier_types:
+        for box in targets[applied:applied + modifiers]:
+            box.add_modifier(Modifier(f"{modifier_type}_modifier", modifier_type, {}))
+            applied += 1
+    return {"world_size": list(level_manager.world_size), "modified_boxes": applied}
+
+
+def time_update(game: GameController, ticks: int, warmup: int) -> dict:
+    """Ticks per second of GameController.update() alone."""
+    for _ in range(warmup):
+        game.update()
+    total = 0.0
+    slowest = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        game.update()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        slowest = max(slowest, elapsed)
+    return {
+        "update_ticks_per_second": ticks / total if total > 0 else float('inf'),
+        "update_ms": total / ticks * 1000.0,
+        "update_max_ms": slowest * 1000.0,
+        "awake_objects": sum(not obj.sleeping for obj in game.dynamic_objects)
+    }
+
+
+def time_draw(game: GameController, frames: int, warmup: int) -> dict:
+    """Frames per second of draw(), stepping the simulation (untimed) between frames."""
+    for _ in range(warmup):
+        game.step()
+        game.draw(0.5)
+    total = 0.0
+    draw_calls = 0
+    for _ in range(frames):
+        game.step()
+        start = time.perf_counter()
+        game.draw(0.5)
+        total += time.perf_counter() - start
+        draw_calls += game.draw_calls
+    return {
+        "draw_frames_per_second": frames / total if total > 0 else float('inf'),
+        "draw_ms": total / frames * 1000.0,
+        "draw_calls": draw_calls / frames
+    }
+
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version())
+    }
+
+
+def load_level_file(game: GameController, path: str, tile_size: int = 32) -> dict:
+    """Replace the running level with an ASCII level file, e.g. from level_generator."""
+    level_manager = game.level_manager
+    level_manager.settings.set(tile_size, "game", "tile_size")
+    with open(path, 'r') as f:
+        static_objects, dynamic_objects, player_start, goal = level_manager.load_ascii_level(f.read())
+    game.install_level(static_objects, dynamic_objects, player_start, goal)
+    game.current_level_data = {"name": os.path.basename(path), "description": "", "hints": []}
+    return {"world_size": list(level_manager.world_size), "boxes": len(dynamic_objects),
+            "tiles": len(static_objects), "modifiers": 0}
+
+
+def measure(game: GameController, build: Callable[[], dict], ticks: int, frames: int, warmup: int,
+            repeat: int) -> dict:
+    """Time update() and draw() on the scene build() sets up.
+
+    Each measurement starts from a freshly built scene and is repeated;
+    the fastest run is kept, as timeit does, since slower runs measure
+    interference from the rest of the machine.
+    """
+    result = {}
+    update = draw = None
+    for _ in range(max(1, repeat)):
+        result.update(build())
+        timing = time_update(game, ticks, warmup)
+        if update is None or timing["update_ms"] < update["update_ms"]:
+            update = timing
+        build()
+        timing = time_draw(game, frames, warmup)
+        if draw is None or timing["draw_ms"] < draw["draw_ms"]:
+            draw = timing
+    result.update(update)
+    result.update(draw)
+    return result
+
+
+def _label(result: dict) -> str:
+    return result.get("level", f"{result['boxes']} boxes")
+
+
+def _print_result(result: dict):
+    print(f"{_label(result):>12}: update {result['update_ms']:7.3f} ms "
+          f"({result['update_ticks_per_second']:8.0f} ticks/s, {result['awake_objects']} awake)  "
+          f"draw {result['draw_ms']:7.3f} ms ({result['draw_frames_per_second']:6.0f} FPS)")
+
+
+def run_suite(box_counts: List[int], tiles: int, modifiers: int, ticks: int, frames: int,
+              warmup: int = 30, seed: int = 0, repeat: int = 3, levels: Sequence[str] = (),
+              tile_size: int = 32) -> dict:
+    """Benchmark one generated scene per box count, then each level file."""
+    pygame.init()
+    game = GameController(input_source=ScriptedInputSource())
+    results = []
+    for boxes in box_counts:
+        result = {"boxes": boxes, "tiles": tiles, "modifiers": modifiers}
+        result.update(measure(game, lambda: build_scene(game, boxes, tiles, modifiers, seed),
+                              ticks, frames, warmup, repeat))
+        _print_result(result)
+        results.append(result)
+    for path in levels:
+        result = {"level": path}
+        result.update(measure(game, lambda: load_level_file(game, path, tile_size),
+                              ticks, frames, warmup, repeat))
+        _print_result(result)
+        results.append(result)
+    report = {
+        "machine": machine_info(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {"ticks": ticks, "frames": frames, "warmup": warmup, "seed": seed, "repeat": repeat,
+                     "tile_size": tile_size},
+        "results": results
+    }
+    pygame.quit()
+    return report
+
+
+def _result_key(result: dict) -> tuple:
+    if "level" in result:
+        return ("level", result["level"])
+    return (result["boxes"], result["tiles"], result["modifiers"])
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """Describe every metric that fell more than threshold (a fraction) below the baseline."""
+    previous: Dict[tuple, dict] = {_result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(_result_key(result))
+        if old is None:
+            continue
+        label = _label(result)
+        for metric in METRICS:
+            if metric not in old or not old[metric]:
+                continue
+            change = result[metric] / old[metric] - 1.0
+            status = "REGRESSION" if change < -threshold else "ok"
+            print(f"{status:<10} {label:>12} {metric}: {old[metric]:.0f} -> {result[metric]:.0f} ({change:+.1%})")
+            if change < -threshold:
+                regressions.append(f"{label} {metric} {change:+.1%}")
+    if baseline.get("settings") != report["settings"]:
+        print("Warning: baseline used different tick/frame counts or seed; scenes were timed at other states.")
+    if baseline.get("machine") != report["machine"]:
+        print("Warning: baseline was recorded on a different machine or Python; compare with care.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark physics and rendering on generated scenes")
+    parser.add_argument("--boxes", default=None,
+                        help="comma-separated box counts to scale through "
+                             f"(default {','.join(str(count) for count in DEFAULT_BOXES)}, or none with --level)")
+    parser.add_argument("--tiles", type=int, default=200, help="static tiles per scene")
+    parser.add_argument("--modifiers", type=int, default=2, help="boxes given each modifier type")
+    parser.add_argument("--ticks", type=int, default=300, help="timed update() calls per scene")
+    parser.add_argument("--frames", type=int, default=120, help="timed draw() calls per scene")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed ticks and frames first")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0, help="scene layout seed")
+    parser.add_argument("--level", action="append", default=[], metavar="FILE",
+                        help="also benchmark an ASCII level file, e.g. from level_generator (repeatable)")
+    parser.add_argument("--tile-size", type=int, default=32, help="game.tile_size for --level files")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON to FILE")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against a saved JSON report and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a metric counts as a regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.boxes is None:
+        box_counts = [] if args.level else list(DEFAULT_BOXES)
+    else:
+        box_counts = [int(count) for count in args.boxes.split(",") if count.strip()]
+    report = run_suite(box_counts, args.tiles, args.modifiers, args.ticks, args.frames,
+                       args.warmup, args.seed, args.repeat, args.level, args.tile_size)
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: " + "; ".join(regressions))
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
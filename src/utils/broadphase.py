@@ -0,0 +1,200 @@
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+import pygame
+
+_left_edge = attrgetter("rect.left")
+
+class SpatialHash:
+    """Uniform grid index over static objects for broadphase collision queries."""
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = max(1, int(cell_size))
+        self.objects = []
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+    @classmethod
+    def from_objects(cls, objects: Sequence, cell_size: int = 64) -> 'SpatialHash':
+        """Build an index over a list of objects with a `rect` attribute."""
+        index = cls(cell_size)
+        for obj in objects:
+            index.insert(obj)
+        return index
+
+    def _cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        # Right/bottom edges are exclusive, so a rect ending exactly on a cell
+        # border does not spill into the next cell
+        return (rect.left // size, (rect.right - 1) // size,
+                rect.top // size, (rect.bottom - 1) // size)
+
+    def insert(self, obj):
+        """Add an object to every cell its rect overlaps."""
+        index = len(self.objects)
+        self.objects.append(obj)
+        x0, x1, y0, y1 = self._cell_range(obj.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+
+    def query(self, rect: pygame.Rect) -> List:
+        """Return objects whose cells overlap rect, in insertion order."""
+        cells = self.cells
+        found = set()
+        x0, x1, y0, y1 = self._cell_range(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        objects = self.objects
+        # Keep the original list order so resolution matches a full scan
+        return [objects[i] for i in sorted(found)]
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+
+class SweepAndPrune:
+    """Sort-and-sweep broadphase on the x-axis for moving objects."""
+
+    def __init__(self, margin: int = 0):
+        self.margin = margin
+        self.objects = []
+        self._rank: Dict[int, int] = {}
+        # Left edges of self.objects as of the last sort, for bisecting
+        self._lefts: List[int] = []
+        # The same edges by object id, to find an object that moved
+        self._edges: Dict[int, int] = {}
+        # Widest tracked object: nothing starting further left of a query can reach it
+        self._max_width = 0
+        self.pair_count = 0
+
+    def set_objects(self, objects: Sequence):
+        """Replace the tracked objects, e.g. after a level load."""
+        # Pairs are reported in the order of the source list, so remember it
+        self._rank = {id(obj): i for i, obj in enumerate(objects)}
+        self._max_width = max((obj.rect.width for obj in objects), default=0)
+        self.objects = sorted(objects, key=_left_edge)
+        self._store_edges()
+
+    def restore_order(self, sorted_objects: Sequence):
+        """Go back to an earlier sorted order of the same objects (level reset).
+
+        Avoids both a full sort and an insertion sort over objects that
+        moved far since.
+        """
+        self.objects = list(sorted_objects)
+        self._store_edges()
+
+    def _store_edges(self):
+        self._lefts = list(map(_left_edge, self.objects))
+        self._edges = dict(zip(map(id, self.objects), self._lefts))
+
+    def update(self, moved: Optional[Sequence] = None):
+        """Re-sort by left edge after objects moved.
+
+        moved lists the only objects that may have moved since the last
+        update, e.g. the awake ones. When they are few, each is moved to its
+        new place by bisection, so resting objects cost nothing.
+        """
+        objects = self.objects
+        if moved is None or len(moved) * 8 > len(objects):
+            # Stable and near-linear, as little moves between frames
+            objects.sort(key=_left_edge)
+            self._store_edges()
+            return
+        lefts = self._lefts
+        edges = self._edges
+        for obj in moved:
+            left = obj.rect.left
+            if left == edges[id(obj)]:
+                continue
+            index = self._index(obj)
+            del objects[index]
+            del lefts[index]
+            index = bisect_right(lefts, left)
+            objects.insert(index, obj)
+            lefts.insert(index, left)
+            edges[id(obj)] = left
+
+    def _index(self, obj) -> int:
+        """Position of obj in the sorted order, found from its edge at the last update."""
+        objects = self.objects
+        index = bisect_left(self._lefts, self._edges[id(obj)])
+        while objects[index] is not obj:
+            index += 1
+        return index
+
+    def query(self, rect: pygame.Rect) -> List:
+        """Return tracked objects whose rects overlap rect, in source list order.
+
+        Bisects the left edges from the last update(), so the cost depends on
+        the objects near rect rather than on how many are tracked.
+        """
+        lefts = self._lefts
+        start = bisect_right(lefts, rect.left - self._max_width)
+        end = bisect_left(lefts, rect.right, start)
+        found = [obj for obj in self.objects[start:end] if obj.rect.colliderect(rect)]
+        # Same order as a full scan of the source list (draw order, wake order)
+        rank = self._rank
+        found.sort(key=lambda obj: rank[id(obj)])
+        return found
+
+    def rank(self, obj) -> int:
+        """Position of obj in the source list."""
+        return self._rank[id(obj)]
+
+    def find_pairs(self, awake: Optional[Sequence] = None) -> List[Tuple]:
+        """Return each pair of objects whose rects overlap exactly once.
+
+        Pairs of two sleeping objects are left out. Pass the awake objects
+        if known: when they are few, the sweep starts only from them, so
+        resting piles cost next to nothing.
+        """
+        objects = self.objects
+        lefts = self._lefts
+        rank = self._rank
+        margin = self.margin
+        pairs = []
+        count = len(objects)
+        # With few awake objects, also look left of each for sleeping ones,
+        # instead of sweeping from every sleeping object
+        look_back = awake is not None and len(awake) * 8 <= count
+        # A sleeping object further left than this cannot reach an awake one
+        reach = self._max_width + margin
+        for i in [self._index(obj) for obj in awake] if look_back else range(count):
+            a = objects[i]
+            a_sleeping = a.sleeping
+            a_rect = a.rect
+            right = a_rect.right + margin
+            top = a_rect.top - margin
+            bottom = a_rect.bottom + margin
+            found = []
+            for j in range(i + 1, count):
+                # Sorted by left edge, so nothing further along can overlap
+                if lefts[j] >= right:
+                    break
+                b = objects[j]
+                b_rect = b.rect
+                if b_rect.top < bottom and b_rect.bottom > top and not (a_sleeping and b.sleeping):
+                    found.append(b)
+            if look_back:
+                # Awake objects further left find a themselves
+                left = a_rect.left - reach
+                for j in range(i - 1, -1, -1):
+                    if lefts[j] <= left:
+                        break
+                    b = objects[j]
+                    b_rect = b.rect
+                    if (b.sleeping and b_rect.right + margin > a_rect.left and
+                            b_rect.top < bottom and b_rect.bottom > top):
+                        found.append(b)
+            for b in found:
+                if rank[id(a)] < rank[id(b)]:
+                    pairs.append((a, b))
+                else:
+                    pairs.append((b, a))
+        pairs.sort(key=lambda pair: (rank[id(pair[0])], rank[id(pair[1])]))
+        self.pair_count = len(pairs)
+        return pairs
@@ -1,6 +1,6 @@
 import pygame
 from enum import Enum
-from src.utils.settings_manager import SettingsManager
+from src.utils.settings_manager import SettingsManager, path_changed
 
 # Initialize settings manager
 settings = SettingsManager()
@@ -35,28 +35,40 @@ MODIFIER_COLORS = {
     "ghostly": tuple(settings.get("colors", "modifiers", "ghostly", default=[128, 128, 128]))
 }
 
+
+def _refresh_modifier_colors(changed):
+    # Updated in place so modules that imported MODIFIER_COLORS see new colors
+    for name in MODIFIER_COLORS:
+        if path_changed(changed, "colors", "modifiers", name):
+            MODIFIER_COLORS[name] = tuple(settings.get("colors", "modifiers", name, default=MODIFIER_COLORS[name]))
+
+settings.subscribe(_refresh_modifier_colors)
+
 # Physics constants
-GRAVITY = settings.get("physics", "gravity", default=0.8)
+GRAVITY = settings.get("physics", "gravity", default=1.6)
+# Simulation steps per second. Physics values are per tick and positions are
+# whole pixels, so another rate would change movement; rendering runs at FPS
+TICK_RATE = 60
 
 # Player physics
 PLAYER_MASS = settings.get("physics", "player", "mass", default=1.0)
-PLAYER_SPEED = settings.get("physics", "player", "max_speed", default=7)
-PLAYER_ACCELERATION = settings.get("physics", "player", "acceleration", default=0.5)
-PLAYER_DECELERATION = settings.get("physics", "player", "deceleration", default=0.35)
-PLAYER_AIR_ACCELERATION = settings.get("physics", "player", "air_acceleration", default=0.2)
-PLAYER_JUMP_FORCE = settings.get("physics", "player", "jump_force", default=-15)
-PLAYER_MAX_SPEED = settings.get("physics", "player", "max_speed", default=20)
+PLAYER_SPEED = settings.get("physics", "player", "max_speed", default=14)
+PLAYER_ACCELERATION = settings.get("physics", "player", "acceleration", default=1.0)
+PLAYER_DECELERATION = settings.get("physics", "player", "deceleration", default=0.7)
+PLAYER_AIR_ACCELERATION = settings.get("physics", "player", "air_acceleration", default=0.4)
+PLAYER_JUMP_FORCE = settings.get("physics", "player", "jump_force", default=-30)
+PLAYER_MAX_SPEED = settings.get("physics", "player", "max_speed", default=40)
 
 # Object physics defaults
 OBJECT_DEFAULT_MASS = settings.get("physics", "object", "default_mass", default=1.0)
-OBJECT_DEFAULT_FRICTION = settings.get("physics", "object", "default_friction", default=0.5)
+OBJECT_DEFAULT_FRICTION = settings.get("physics", "object", "default_friction", default=1.0)
 OBJECT_DEFAULT_ELASTICITY = settings.get("physics", "object", "default_elasticity", default=0.2)
 
 # Modifier physics
 BOUNCY_ELASTICITY = settings.get("physics", "modifiers", "bouncy_elasticity", default=0.9)
 HEAVY_MASS_MULTIPLIER = settings.get("physics", "modifiers", "heavy_mass_multiplier", default=5)
 FLOATY_GRAVITY_SCALE = settings.get("physics", "modifiers", "floaty_gravity_scale", default=0.1)
-STICKY_DRAG_FORCE = settings.get("physics", "modifiers", "sticky_drag_force", default=10)
+STICKY_DRAG_FORCE = settings.get("physics", "modifiers", "sticky_drag_force", default=20)
 GHOSTLY_ALPHA = settings.get("physics", "modifiers", "ghostly_alpha", default=128)
 
 # Controls
@@ -74,7 +86,7 @@ MAX_ACTIVE_MODIFIERS = settings.get("game", "max_active_modifiers", default=3)
 LEVEL_DIRECTORY = settings.get("game", "level_directory", default="levels/")
 MODIFIER_COOLDOWN = settings.get("game", "modifier_cooldown", default=0.5)
 MALLET_RANGE = settings.get("game", "mallet_range", default=100)
-MALLET_HIT_FORCE = settings.get("game", "mallet_hit_force", default=5)
+MALLET_HIT_FORCE = settings.get("game", "mallet_hit_force", default=10)
 
 # UI Settings
 FONT_NAME = settings.get("ui", "font_name", default=None)
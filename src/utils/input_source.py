@@ -0,0 +1,152 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Set, Tuple
+import pygame
+
+class KeyState:
+    """Indexable key state, compatible with the result of pygame.key.get_pressed()."""
+
+    def __init__(self, pressed: Iterable[int] = ()):
+        self.pressed: Set[int] = set(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+class InputSource(ABC):
+    """Supplies the events, key state and mouse position the game consumes."""
+
+    def begin_tick(self, tick: int):
+        """Called by the game controller before simulating each tick."""
+        pass
+
+    @abstractmethod
+    def get_events(self) -> List[pygame.event.Event]:
+        pass
+
+    @abstractmethod
+    def get_pressed(self):
+        pass
+
+    @abstractmethod
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        pass
+
+
+class PygameInputSource(InputSource):
+    """Polls pygame directly; used when playing with a window."""
+
+    def get_events(self) -> List[pygame.event.Event]:
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return pygame.mouse.get_pos()
+
+
+class ScriptedInputSource(InputSource):
+    """Input fed by code, for headless runs, tests and automated playtesting."""
+
+    def __init__(self):
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+        self.events: List[pygame.event.Event] = []
+
+    def press(self, key: int):
+        """Hold a key down and queue its KEYDOWN event."""
+        self.keys.pressed.add(key)
+        self.events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def release(self, key: int):
+        """Release a key and queue its KEYUP event."""
+        self.keys.pressed.discard(key)
+        self.events.append(pygame.event.Event(pygame.KEYUP, key=key))
+
+    def move_mouse(self, pos: Tuple[int, int]):
+        self.mouse_pos = tuple(pos)
+
+    def mouse_down(self, pos: Tuple[int, int], button: int = 1):
+        self.move_mouse(pos)
+        self.events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.mouse_pos, button=button))
+
+    def mouse_up(self, pos: Tuple[int, int], button: int = 1):
+        self.move_mouse(pos)
+        self.events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=self.mouse_pos, button=button))
+
+    def click(self, pos: Tuple[int, int], button: int = 1):
+        """Queue a full press and release at pos."""
+        self.mouse_down(pos, button)
+        self.mouse_up(pos, button)
+
+    def quit(self):
+        self.events.append(pygame.event.Event(pygame.QUIT))
+
+    def get_events(self) -> List[pygame.event.Event]:
+        events, self.events = self.events, []
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.mouse_pos
+
+
+class QueuedInputSource(InputSource):
+    """Input polled on the main thread and consumed on the simulation thread.
+
+    pygame events can only be read on the thread that owns the window, so
+    the render loop calls pump() each frame and the simulation drains the
+    queued events at its own pace.
+    """
+
+    def __init__(self, inner: InputSource):
+        self.inner = inner
+        self.lock = threading.Lock()
+        self.events: List[pygame.event.Event] = []
+        self.keys = inner.get_pressed()
+        self.mouse_pos = inner.get_mouse_pos()
+
+    def pump(self):
+        """Poll the inner source; call from the main thread."""
+        events = self.inner.get_events()
+        keys = self.inner.get_pressed()
+        mouse_pos = self.inner.get_mouse_pos()
+        with self.lock:
+            self.events.extend(events)
+            self.keys = keys
+            self.mouse_pos = mouse_pos
+
+    def get_events(self) -> List[pygame.event.Event]:
+        with self.lock:
+            events, self.events = self.events, []
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.mouse_pos
+
+
+class WorldInputSource(InputSource):
+    """Reports the mouse in world coordinates when the view is scrolled by a camera."""
+
+    def __init__(self, inner: InputSource, camera):
+        self.inner = inner
+        self.camera = camera
+
+    def get_events(self) -> List[pygame.event.Event]:
+        return self.inner.get_events()
+
+    def get_pressed(self):
+        return self.inner.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.camera.to_world(self.inner.get_mouse_pos())
+
+
+# Shared default for objects created without an explicit input source
+pygame_input = PygameInputSource()
@@ -0,0 +1,262 @@
+"""Compiled binary levels, cached next to their JSON/ASCII sources.
+
+A compiled level is a fixed header followed by packed arrays: rects
+(x, y, width, height) of the static and dynamic objects, a palette index
+and flag byte per object, a small JSON block (palette, player start, goal,
+level info) and, for ASCII levels, the raw tile grid. It is read with mmap
+and array.frombytes, so loading costs a few copies instead of parsing.
+
+Compiled files live in a __levelcache__ directory beside the sources (like
+__pycache__) and are keyed by the source's mtime and size, falling back to
+its CRC32 when only the mtime changed, plus the settings that affect
+parsing. Run from the project root to compare cold and warm load times:
+    python -m src.utils.level_cache [--dir src/levels] [--clear]
+"""
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import List, Optional, Tuple
+from src.models.game_object import GameObject
+
+CACHE_DIRECTORY = "__levelcache__"
+CACHE_EXTENSION = ".lvc"
+MAGIC = b"MMLV"
+# Bump when the layout or the way levels are parsed changes
+VERSION = 1
+# magic, version, coordinate typecode, source mtime_ns, source size, source CRC32,
+# settings CRC32, world size, static count, dynamic count, info length, grid length
+HEADER = struct.Struct('<4sHcxqqIIiiIIII')
+FLAG_GHOST_PASSABLE = 1
+FLAG_NOT_PUSHABLE = 2
+
+
+class CompiledLevel:
+    """Objects of one level as flat arrays, ready to be written or rebuilt."""
+
+    def __init__(self, world_size: Tuple[int, int], static_rects: array, static_colors: array,
+                 static_flags: array, dynamic_rects: array, dynamic_colors: array, dynamic_flags: array,
+                 info: dict, tile_grid: bytes = b""):
+        self.world_size = world_size
+        self.static_rects = static_rects
+        self.static_colors = static_colors
+        self.static_flags = static_flags
+        self.dynamic_rects = dynamic_rects
+        self.dynamic_colors = dynamic_colors
+        self.dynamic_flags = dynamic_flags
+        # Palette, player start, goal, name/description/hints and tile size
+        self.info = info
+        self.tile_grid = tile_grid
+
+    @classmethod
+    def from_objects(cls, static_objects: list, dynamic_objects: list, player_start, goal,
+                     world_size: Tuple[int, int], info: dict, tile_grid: List[str] = (),
+                     tile_size: Tuple[int, int] = (0, 0)) -> "CompiledLevel":
+        palette: List[list] = []
+        palette_index = {}
+
+        def pack(objects):
+            values = []
+            colors = array('H')
+            flags = array('B')
+            for obj in objects:
+                values.extend(obj.rect)
+                color = tuple(obj.color)
+                if color not in palette_index:
+                    palette_index[color] = len(palette)
+                    palette.append(list(color))
+                colors.append(palette_index[color])
+                flags.append((FLAG_GHOST_PASSABLE if obj.is_ghost_passable else 0) |
+                             (0 if obj.is_pushable else FLAG_NOT_PUSHABLE))
+            return values, colors, flags
+
+        static_values, static_colors, static_flags = pack(static_objects)
+        dynamic_values, dynamic_colors, dynamic_flags = pack(dynamic_objects)
+        # int16 keeps files small; levels larger than 32767 pixels need int32
+        values = static_values + dynamic_values
+        fits = all(-32768 <= value <= 32767 for value in values)
+        typecode = 'h' if fits else 'i'
+        info = dict(info)
+        info.update({
+            "palette": palette,
+            "player_start": list(player_start.rect.topleft) if player_start else None,
+            "goal": [goal.rect.x, goal.rect.y, list(goal.color)] if goal else None,
+            "tile_size": list(tile_size)
+        })
+        return cls(world_size, array(typecode, static_values), static_colors, static_flags,
+                   array(typecode, dynamic_values), dynamic_colors, dynamic_flags, info,
+                   "\n".join(tile_grid).encode())
+
+    def build(self) -> tuple:
+        """Create the level's objects, as LevelManager.load_level returns them."""
+        palette = [tuple(color) for color in self.info["palette"]]
+
+        def unpack(rects, colors, flags):
+            objects = []
+            for i in range(len(colors)):
+                x, y, width, height = rects[i * 4:i * 4 + 4]
+                obj = GameObject(x, y, width, height, palette[colors[i]])
+                obj.is_ghost_passable = bool(flags[i] & FLAG_GHOST_PASSABLE)
+                if flags[i] & FLAG_NOT_PUSHABLE:
+                    obj.is_pushable = False
+                objects.append(obj)
+            return objects
+
+        static_objects = unpack(self.static_rects, self.static_colors, self.static_flags)
+        dynamic_objects = unpack(self.dynamic_rects, self.dynamic_colors, self.dynamic_flags)
+        player_start = goal = None
+        if self.info["player_start"] is not None:
+            x, y = self.info["player_start"]
+            player_start = GameObject(x, y, 30, 50, (0, 0, 255))
+        if self.info["goal"] is not None:
+            x, y, color = self.info["goal"]
+            goal = GameObject(x, y, 30, 30, tuple(color))
+        return static_objects, dynamic_objects, player_start, goal
+
+    def write(self, path: str, source_stat: os.stat_result, source_crc: int, settings_crc: int):
+        """Write atomically, so a crash or a second process never sees half a file."""
+        info = json.dumps(self.info).encode()
+        header = HEADER.pack(MAGIC, VERSION, self.static_rects.typecode.encode(), source_stat.st_mtime_ns,
+                             source_stat.st_size, source_crc, settings_crc, self.world_size[0],
+                             self.world_size[1], len(self.static_colors), len(self.dynamic_colors),
+                             len(info), len(self.tile_grid))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            # Widest items first, so every array stays aligned to its item size
+            for data in (self.static_rects, self.dynamic_rects, self.static_colors, self.dynamic_colors,
+                         self.static_flags, self.dynamic_flags):
+                data.tofile(f)
+            f.write(info)
+            f.write(self.tile_grid)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def read(cls, path: str) -> Tuple[tuple, "CompiledLevel"]:
+        """Map a compiled file and copy its arrays out; returns (header fields, level)."""
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            fields = HEADER.unpack_from(data)
+            (magic, version, typecode, _, _, _, _, width, height, static_count, dynamic_count,
+             info_length, grid_length) = fields
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"not a version {VERSION} compiled level")
+            typecode = typecode.decode()
+            offset = HEADER.size
+            view = memoryview(data)
+            try:
+                def take(code: str, count: int) -> array:
+                    nonlocal offset
+                    values = array(code)
+                    end = offset + count * values.itemsize
+                    values.frombytes(view[offset:end])
+                    offset = end
+                    return values
+
+                static_rects = take(typecode, static_count * 4)
+                dynamic_rects = take(typecode, dynamic_count * 4)
+                static_colors = take('H', static_count)
+                dynamic_colors = take('H', dynamic_count)
+                static_flags = take('B', static_count)
+                dynamic_flags = take('B', dynamic_count)
+                info = json.loads(bytes(view[offset:offset + info_length]))
+                offset += info_length
+                tile_grid = bytes(view[offset:offset + grid_length])
+            finally:
+                view.release()
+        level = cls((width, height), static_rects, static_colors, static_flags, dynamic_rects,
+                    dynamic_colors, dynamic_flags, info, tile_grid)
+        return fields, level
+
+
+def cache_path(source_path: str) -> str:
+    directory, name = os.path.split(source_path)
+    return os.path.join(directory, CACHE_DIRECTORY, name + CACHE_EXTENSION)
+
+
+def source_crc(source_path: str) -> int:
+    with open(source_path, 'rb') as f:
+        return zlib.crc32(f.read())
+
+
+def load_cached(source_path: str, settings_crc: int) -> Optional[CompiledLevel]:
+    """The compiled level for source_path, or None if it is missing or stale."""
+    path = cache_path(source_path)
+    try:
+        source_stat = os.stat(source_path)
+        fields, level = CompiledLevel.read(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    mtime_ns, size, crc, cached_settings = fields[3:7]
+    if cached_settings != settings_crc or size != source_stat.st_size:
+        return None
+    if mtime_ns != source_stat.st_mtime_ns:
+        # Touched (checkout, copy) but maybe not changed: compare contents
+        crc = source_crc(source_path)
+        if crc != fields[5]:
+            return None
+        try:
+            level.write(path, source_stat, crc, settings_crc)
+        except OSError:
+            pass
+    return level
+
+
+def save_cached(source_path: str, level: CompiledLevel, settings_crc: int):
+    try:
+        source_stat = os.stat(source_path)
+        level.write(cache_path(source_path), source_stat, source_crc(source_path), settings_crc)
+    except OSError as e:
+        # A read-only install still works, it just parses every time
+        print(f"Warning: could not write compiled level for {source_path}: {e}")
+
+
+def time_levels(directory: str, clear: bool = False) -> int:
+    """Print cold (parse and compile) and warm (compiled) load times for every level."""
+    from src.models.level_manager import LevelManager
+
+    level_manager = LevelManager()
+    level_manager.levels_dir = directory
+    level_manager.levels = level_manager._load_level_list()
+    if clear:
+        shutil.rmtree(os.path.join(directory, CACHE_DIRECTORY), ignore_errors=True)
+    if not level_manager.levels:
+        print(f"No levels found in {directory}")
+        return 1
+    for number, name in enumerate(level_manager.levels):
+        source_path = os.path.join(directory, name)
+        times = []
+        for cache in (False, True):
+            if not cache:
+                # Cold: remove the compiled file so this load parses and recompiles
+                try:
+                    os.remove(cache_path(source_path))
+                except OSError:
+                    pass
+            start = time.perf_counter()
+            level_manager.load_level(number)
+            times.append(time.perf_counter() - start)
+        compiled = cache_path(source_path)
+        compiled_size = os.path.getsize(compiled) if os.path.exists(compiled) else 0
+        print(f"{name}: cold {times[0] * 1000:8.2f} ms, warm {times[1] * 1000:8.2f} ms "
+              f"({times[0] / max(times[1], 1e-9):.1f}x), "
+              f"{os.path.getsize(source_path)} -> {compiled_size} bytes")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold and compiled (warm) level load times")
+    parser.add_argument("--dir", default=os.path.join("src", "levels"), help="level directory")
+    parser.add_argument("--clear", action="store_true", help="delete the compiled levels first")
+    args = parser.parse_args()
+    sys.exit(time_levels(args.dir, args.clear))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Procedural stress levels in the ASCII level format.
+
+Levels are generated one row at a time from a seeded RNG and written as
+they are produced, so even multi-megabyte maps never exist in memory as a
+whole. The same seed and options always give the same level.
+
+Run from the project root:
+    python -m src.utils.level_generator big.txt --width 500 --height 200 --seed 1 [--time-load]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, Iterator, Optional, TextIO
+
+
+class LevelGenerator:
+    """Emits rows of a bordered level using the LevelManager.ascii_map symbols.
+
+    Platforms ('#') are horizontal runs, ghost walls ('G') vertical runs
+    carried over from row to row, and boxes ('B', or 'H' for heavy ones)
+    fill empty cells at the given density. The player start ('P') is near
+    the bottom left and the goal ('X') near the bottom right, with the cells
+    around them kept clear.
+    """
+
+    def __init__(self, width: int, height: int, seed: int = 0, platform_density: float = 0.02,
+                 platform_length: int = 8, ghost_density: float = 0.002, ghost_length: int = 4,
+                 box_density: float = 0.03, heavy_share: float = 0.2):
+        if width < 8 or height < 5:
+            raise ValueError(f"Level must be at least 8x5 tiles, got {width}x{height}")
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.platform_density = platform_density
+        self.platform_length = max(1, platform_length)
+        self.ghost_density = ghost_density
+        self.ghost_length = max(1, ghost_length)
+        self.box_density = box_density
+        self.heavy_share = heavy_share
+        # Number of each symbol emitted so far
+        self.counts: Dict[str, int] = {}
+
+    def _reserved(self, rng: random.Random) -> Dict[tuple, str]:
+        """Player start and goal cells, plus the empty cells they need around them."""
+        floor = self.height - 1
+        start_x = rng.randrange(2, max(3, self.width // 10))
+        goal_x = rng.randrange(self.width - max(2, self.width // 10), self.width - 1)
+        # The player is taller than a tile, so the cell below the start stays empty too
+        reserved = {(start_x, floor - 2): 'P', (start_x, floor - 1): ' ', (goal_x, floor - 1): 'X'}
+        for x in (start_x - 1, start_x + 1):
+            for y in (floor - 3, floor - 2, floor - 1):
+                reserved.setdefault((x, y), ' ')
+        reserved.setdefault((start_x, floor - 3), ' ')
+        return reserved
+
+    def rows(self) -> Iterator[str]:
+        """Yield the level one row (without newline) at a time."""
+        rng = random.Random(self.seed)
+        width = self.width
+        reserved = self._reserved(rng)
+        # Ghost walls still growing downwards: column -> rows left
+        ghost_walls: Dict[int, int] = {}
+        counts = self.counts
+        counts.clear()
+
+        for y in range(self.height):
+            if y == 0 or y == self.height - 1:
+                row = ['#'] * width
+            else:
+                row = ['#'] + [' '] * (width - 2) + ['#']
+                # Platforms: runs started at random, cut off at the border
+                x = 1
+                while x < width - 1:
+                    if rng.random() < self.platform_density:
+                        length = rng.randint(1, self.platform_length)
+                        for i in range(x, min(x + length, width - 1)):
+                            row[i] = '#'
+                        x += length + 1
+                    else:
+                        x += 1
+                for x in list(ghost_walls):
+                    row[x] = 'G'
+                    ghost_walls[x] -= 1
+                    if not ghost_walls[x]:
+                        del ghost_walls[x]
+                for x in range(1, width - 1):
+                    if row[x] != ' ':
+                        continue
+                    if rng.random() < self.ghost_density:
+                        row[x] = 'G'
+                        if self.ghost_length > 1:
+                            ghost_walls[x] = rng.randint(1, self.ghost_length - 1)
+                    elif rng.random() < self.box_density:
+                        row[x] = 'H' if rng.random() < self.heavy_share else 'B'
+            for (x, reserved_y), char in reserved.items():
+                if reserved_y == y:
+                    row[x] = char
+            for char in row:
+                counts[char] = counts.get(char, 0) + 1
+            yield ''.join(row)
+
+    def write(self, out: TextIO):
+        # No newline after the last row, like the hand-made levels
+        for y, row in enumerate(self.rows()):
+            out.write(row if y == self.height - 1 else row + '\n')
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            self.write(f)
+
+
+def time_load(path: str, tile_size: Optional[int] = None) -> float:
+    """Seconds LevelManager.load_ascii_level takes for a level file."""
+    from src.models.level_manager import LevelManager
+
+    level_manager = LevelManager()
+    if tile_size is not None:
+        level_manager.settings.set(tile_size, "game", "tile_size")
+    with open(path, 'r') as f:
+        level_txt = f.read()
+    start = time.perf_counter()
+    static_objects, dynamic_objects, player_start, goal = level_manager.load_ascii_level(level_txt)
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {path}: {len(static_objects)} static colliders, {len(dynamic_objects)} boxes, "
+          f"{level_manager.world_size[0]}x{level_manager.world_size[1]} px in {elapsed * 1000:.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large ASCII stress level")
+    parser.add_argument("output", help="level file to write (.txt), or - for stdout")
+    parser.add_argument("--width", type=int, default=500, help="columns")
+    parser.add_argument("--height", type=int, default=200, help="rows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--platforms", type=float, default=0.02,
+                        help="chance of a platform starting at each cell")
+    parser.add_argument("--platform-length", type=int, default=8, help="longest platform, in tiles")
+    parser.add_argument("--ghosts", type=float, default=0.002,
+                        help="chance of a ghost wall starting at each empty cell")
+    parser.add_argument("--ghost-length", type=int, default=4, help="tallest ghost wall, in tiles")
+    parser.add_argument("--boxes", type=float, default=0.03, help="share of empty cells holding a box")
+    parser.add_argument("--heavy", type=float, default=0.2, help="share of boxes that are heavy")
+    parser.add_argument("--time-load", action="store_true",
+                        help="time LevelManager.load_ascii_level on the written level")
+    parser.add_argument("--tile-size", type=int, default=32,
+                        help="with --time-load: game.tile_size to load with (0 stretches to the window)")
+    args = parser.parse_args()
+
+    generator = LevelGenerator(args.width, args.height, args.seed, args.platforms, args.platform_length,
+                               args.ghosts, args.ghost_length, args.boxes, args.heavy)
+    start = time.perf_counter()
+    if args.output == "-":
+        generator.write(sys.stdout)
+        return
+    generator.save(args.output)
+    elapsed = time.perf_counter() - start
+    counts = generator.counts
+    print(f"Wrote {args.output}: {args.width}x{args.height} tiles, {counts.get('#', 0)} platform, "
+          f"{counts.get('G', 0)} ghost, {counts.get('B', 0)} box and {counts.get('H', 0)} heavy tiles "
+          f"in {elapsed:.2f}s")
+    if args.time_load:
+        time_load(args.output, args.tile_size)
+
+
+if __name__ == "__main__":
+    main()
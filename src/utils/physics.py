@@ -1,68 +1,171 @@
-from typing import List
+from typing import List, Optional, Tuple
 import pygame
 from src.models.game_object import GameObject
+from src.utils.broadphase import SpatialHash
 from src.utils.settings_manager import SettingsManager
 
 class PhysicsSystem:
     def __init__(self):
         self.settings = SettingsManager()
-        self.friction_coefficient = 0.15  # Add friction coefficient
+        # Compiled settings for per-contact reads
+        self.cfg = self.settings.compiled
+        self.settings.subscribe(self._on_settings_changed)
+        self.friction_coefficient = 0.3  # Add friction coefficient
         self.bounce_multiplier = 1.5  # Bounce modifier multiplier
+        # Broadphase counters, reset once per frame by the game controller
+        self.static_tests = 0
+        self.static_tests_avoided = 0
+        # Level size in pixels, set on level load; None keeps objects on screen
+        self.world_size: Optional[Tuple[int, int]] = None
 
-    def handle_collisions(self, game_object: GameObject, static_objects: List[GameObject]):
+    def _on_settings_changed(self, changed):
+        self.cfg = self.settings.compiled
+
+    def reset_frame_stats(self):
+        """Reset the per-frame broadphase counters."""
+        self.static_tests = 0
+        self.static_tests_avoided = 0
+
+    def _nearby_static(self, area: pygame.Rect, static_objects: List[GameObject],
+                       static_index: Optional[SpatialHash]) -> List[GameObject]:
+        """Return the static objects worth testing against a moving area."""
+        if static_index is None:
+            self.static_tests += len(static_objects)
+            return static_objects
+        # Resolving a contact can shift the object by up to its own size, so
+        # query a margin around it to catch anything it may be pushed into
+        candidates = static_index.query(area.inflate(area.width * 2, area.height * 2))
+        self.static_tests += len(candidates)
+        self.static_tests_avoided += len(static_objects) - len(candidates)
+        return candidates
+
+    def sweep(self, rect: pygame.Rect, dx: float, dy: float,
+              static_objects: List[GameObject]) -> Optional[Tuple[float, GameObject]]:
+        """Swept AABB test: find the first static object hit moving rect by (dx, dy).
+
+        Returns (time_of_impact, static_obj) with time in [0, 1), or None.
+        Objects already overlapping rect are skipped; callers resolve those
+        with a discrete pass.
+        """
+        best = None
+        for static_obj in static_objects:
+            other = static_obj.rect
+            if rect.colliderect(other):
+                continue
+
+            if dx > 0:
+                x_entry = (other.left - rect.right) / dx
+                x_exit = (other.right - rect.left) / dx
+            elif dx < 0:
+                x_entry = (other.right - rect.left) / dx
+                x_exit = (other.left - rect.right) / dx
+            elif rect.right > other.left and rect.left < other.right:
+                x_entry, x_exit = float('-inf'), float('inf')
+            else:
+                continue
+
+            if dy > 0:
+                y_entry = (other.top - rect.bottom) / dy
+                y_exit = (other.bottom - rect.top) / dy
+            elif dy < 0:
+                y_entry = (other.bottom - rect.top) / dy
+                y_exit = (other.top - rect.bottom) / dy
+            elif rect.bottom > other.top and rect.top < other.bottom:
+                y_entry, y_exit = float('-inf'), float('inf')
+            else:
+                continue
+
+            entry = max(x_entry, y_entry)
+            if entry < min(x_exit, y_exit) and 0 <= entry < 1:
+                if best is None or entry < best[0]:
+                    best = (entry, static_obj)
+        return best
+
+    def _land(self, game_object: GameObject, static_obj: GameObject):
+        """Apply landing response after game_object comes down onto static_obj."""
+        game_object.rect.bottom = static_obj.rect.top
+        game_object.on_ground = True
+        
+        # Apply bounce if the object is bouncy
+        if hasattr(static_obj, 'modifiers') and 'Bouncy' in static_obj.modifiers:
+            game_object.velocity_y = -abs(game_object.velocity_y) * self.bounce_multiplier
+        else:
+            game_object.velocity_y = 0
+            
+        # Apply friction when landing on objects
+        if abs(game_object.velocity_x) > 0:
+            friction_force = self.friction_coefficient * (1 if game_object.velocity_x > 0 else -1)
+            game_object.velocity_x = max(0, abs(game_object.velocity_x) - friction_force) * (1 if game_object.velocity_x > 0 else -1)
+
+    def handle_collisions(self, game_object: GameObject, static_objects: List[GameObject],
+                          static_index: Optional[SpatialHash] = None):
         if not hasattr(game_object, 'collision_enabled') or game_object.collision_enabled:
             was_on_ground = game_object.on_ground
             game_object.on_ground = False
+            rect = game_object.rect
+
+            # The object moves once per step: from where it started this step
+            # (before update()) to where update() moved it, stopping at the
+            # first static object in the way
+            target_x, target_y = rect.topleft
+            rect.topleft = (game_object.prev_x, game_object.prev_y)
             
             # --- Vertical Collision Pass ---
-            game_object.rect.y += game_object.velocity_y
-            
-            for static_obj in static_objects:
+            dy = target_y - rect.y
+            candidates = self._nearby_static(rect.union(rect.move(0, dy)), static_objects, static_index)
+            hit = self.sweep(rect, 0, dy, candidates)
+            if hit is None:
+                rect.y = target_y
+            elif dy > 0:
+                # Moving down / Landing
+                self._land(game_object, hit[1])
+            else:
+                # Moving up / Hitting ceiling
+                rect.top = hit[1].rect.bottom
+                game_object.velocity_y = 0
+
+            # Resolve anything the object already overlapped before moving
+            for static_obj in candidates:
                 if game_object.collides_with(static_obj):
-                    # Moving down / Landing
                     if game_object.velocity_y > 0:
-                        game_object.rect.bottom = static_obj.rect.top
-                        game_object.on_ground = True
-                        
-                        # Apply bounce if the object is bouncy
-                        if hasattr(static_obj, 'modifiers') and 'Bouncy' in static_obj.modifiers:
-                            game_object.velocity_y = -abs(game_object.velocity_y) * self.bounce_multiplier
-                        else:
-                            game_object.velocity_y = 0
-                            
-                        # Apply friction when landing on objects
-                        if abs(game_object.velocity_x) > 0:
-                            friction_force = self.friction_coefficient * (1 if game_object.velocity_x > 0 else -1)
-                            game_object.velocity_x = max(0, abs(game_object.velocity_x) - friction_force) * (1 if game_object.velocity_x > 0 else -1)
-                    
-                    # Moving up / Hitting ceiling
+                        self._land(game_object, static_obj)
                     elif game_object.velocity_y < 0:
-                        game_object.rect.top = static_obj.rect.bottom
+                        rect.top = static_obj.rect.bottom
                         game_object.velocity_y = 0
 
             # --- Horizontal Collision Pass ---
-            game_object.rect.x += game_object.velocity_x
+            dx = target_x - rect.x
+            candidates = self._nearby_static(rect.union(rect.move(dx, 0)), static_objects, static_index)
+            hit = self.sweep(rect, dx, 0, candidates)
+            if hit is None:
+                rect.x = target_x
+            else:
+                if dx > 0:
+                    rect.right = hit[1].rect.left
+                else:
+                    rect.left = hit[1].rect.right
+                game_object.velocity_x = 0
             
-            for static_obj in static_objects:
+            for static_obj in candidates:
                 if game_object.collides_with(static_obj):
                     # Moving right
                     if game_object.velocity_x > 0:
-                        game_object.rect.right = static_obj.rect.left
+                        rect.right = static_obj.rect.left
                     # Moving left
                     elif game_object.velocity_x < 0:
-                        game_object.rect.left = static_obj.rect.right
+                        rect.left = static_obj.rect.right
                     
                     # Stop horizontal movement on collision
                     game_object.velocity_x = 0
 
             # Additional stability check for standing on moving boxes
             if game_object.on_ground and not was_on_ground:
-                for static_obj in static_objects:
-                    if (game_object.rect.bottom == static_obj.rect.top and 
-                        game_object.rect.right > static_obj.rect.left and 
-                        game_object.rect.left < static_obj.rect.right):
+                for static_obj in self._nearby_static(rect, static_objects, static_index):
+                    if (rect.bottom == static_obj.rect.top and 
+                        rect.right > static_obj.rect.left and 
+                        rect.left < static_obj.rect.right):
                         # Ensure proper alignment when landing
-                        game_object.rect.bottom = static_obj.rect.top
+                        rect.bottom = static_obj.rect.top
 
     def handle_object_interaction(self, obj1: GameObject, obj2: GameObject):
         # Check if either object has modifiers that affect interaction
@@ -105,7 +208,7 @@ class PhysicsSystem:
 
         # Apply friction when player is on top of an object
         if player.on_ground and dy < 0:
-            friction = self.settings.get("physics", "object", "friction", default=0.8)
+            friction = self.cfg.physics.object.friction
             # Slow down player's horizontal movement
             player.velocity_x *= friction
             # Transfer some of player's horizontal movement to box
@@ -122,13 +225,13 @@ class PhysicsSystem:
                 if obj.is_pushable:
                     # Scale push force by mass ratio
                     force = push_force * (player.mass / obj.mass) * abs(player.velocity_x)
-                    obj.velocity_x = min(obj.velocity_x - force, -0.5)  # Ensure minimum movement
+                    obj.velocity_x = min(obj.velocity_x - force, -1.0)  # Ensure minimum movement
                 player.velocity_x = max(0, player.velocity_x)
             else:  # Player is to the left
                 player.rect.right = obj.rect.left
                 if obj.is_pushable:
                     force = push_force * (player.mass / obj.mass) * abs(player.velocity_x)
-                    obj.velocity_x = max(obj.velocity_x + force, 0.5)  # Ensure minimum movement
+                    obj.velocity_x = max(obj.velocity_x + force, 1.0)  # Ensure minimum movement
                 player.velocity_x = min(0, player.velocity_x)
         else:
             # Vertical collision
@@ -142,9 +245,9 @@ class PhysicsSystem:
                 # Enhanced bouncy behavior
                 is_bouncy = any(mod.effect_type == 'bouncy' for mod in obj.active_modifiers)
                 if is_bouncy:
-                    bounce_force = self.settings.get("physics", "modifiers", "bouncy_elasticity", default=0.9)
+                    bounce_force = self.cfg.physics.modifiers.bouncy_elasticity
                     # Scale bounce by falling speed with a minimum bounce
-                    min_bounce = 8
+                    min_bounce = 16
                     impact_velocity = abs(player.velocity_y)
                     bounce_velocity = max(impact_velocity * bounce_force, min_bounce)
                     player.velocity_y = -bounce_velocity
@@ -157,14 +260,18 @@ class PhysicsSystem:
                     player.velocity_y = 0
                     if obj.is_pushable:
                         # Apply gradual stabilizing force
-                        obj.velocity_y = min(obj.velocity_y + 0.2 * (player.mass / obj.mass), 1.0)
+                        obj.velocity_y = min(obj.velocity_y + 0.4 * (player.mass / obj.mass), 2.0)
                         # Dampen box horizontal movement when landed on
                         obj.velocity_x *= 0.9
 
     def keep_in_bounds(self, game_object: GameObject):
-        """Keep object within screen bounds."""
-        screen_width = self.settings.get_setting('screen_width', 800)
-        screen_height = self.settings.get_setting('screen_height', 600)
+        """Keep object within the level (the screen unless world_size is set)."""
+        if self.world_size is not None:
+            screen_width, screen_height = self.world_size
+        else:
+            window = self.cfg.window
+            screen_width = window.width
+            screen_height = window.height
         
         # Allow ghostly objects to pass through bounds
         if hasattr(game_object, 'collision_enabled') and not game_object.collision_enabled:
@@ -196,8 +303,9 @@ class PhysicsSystem:
 physics_system = PhysicsSystem()
 
 # Export the methods as module-level functions that use the global instance
-def handle_collisions(game_object: GameObject, static_objects: List[GameObject]):
-    physics_system.handle_collisions(game_object, static_objects)
+def handle_collisions(game_object: GameObject, static_objects: List[GameObject],
+                      static_index: Optional[SpatialHash] = None):
+    physics_system.handle_collisions(game_object, static_objects, static_index)
 
 def handle_object_interaction(obj1: GameObject, obj2: GameObject):
     physics_system.handle_object_interaction(obj1, obj2)
@@ -0,0 +1,284 @@
+from typing import List, Optional, Sequence, Tuple
+from src.models.game_object import GameObject
+from src.utils.broadphase import SpatialHash
+from src.utils.settings_manager import SettingsManager
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it objects integrate themselves
+    np = None
+
+
+def physics_world_available() -> bool:
+    """Check whether the vectorized physics world can be used."""
+    return np is not None
+
+
+class PhysicsWorld:
+    """Struct-of-arrays store that steps all awake dynamic bodies in batch.
+
+    Positions, velocities and per-body parameters live in contiguous NumPy
+    arrays, which hold the bodies' state through a tick. Objects are only
+    written where Python code works on them: bodies close to static
+    geometry around their collision pass, rects before the pair pass, the
+    bodies in a contact, and whatever changed at the end of the tick.
+    Anything that changes a body in between calls refresh_body(), as
+    GameObject does for modifiers, settings, wake-ups and drags.
+    """
+
+    def __init__(self, settings: Optional[SettingsManager] = None):
+        if np is None:
+            raise RuntimeError("PhysicsWorld requires NumPy")
+        self.settings = settings or SettingsManager()
+        self.cfg = self.settings.compiled
+        self.bodies: List[GameObject] = []
+        # Level size in pixels, set on level load; None keeps bodies on screen
+        self.world_size: Optional[Tuple[int, int]] = None
+        self.static_index: Optional[SpatialHash] = None
+        # Summed-area table over the static index cells, see set_static_index
+        self._static_table = None
+        self._static_origin = (0, 0)
+        self._allocate(0)
+
+    def _allocate(self, count: int):
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.width = np.zeros(count)
+        self.height = np.zeros(count)
+        self.velocity_x = np.zeros(count)
+        self.velocity_y = np.zeros(count)
+        self.mass = np.ones(count)
+        self.gravity = np.zeros(count)
+        self.friction = np.zeros(count)
+        self.on_ground = np.zeros(count, dtype=bool)
+        self.collision_enabled = np.ones(count, dtype=bool)
+        # Awake and not dragged: the bodies the world moves this tick
+        self.active = np.zeros(count, dtype=bool)
+        # Position at the start of the step, which handle_collisions sweeps from
+        self.start_x = np.zeros(count)
+        self.start_y = np.zeros(count)
+        # State last written to or read from the objects; writes skip what matches
+        self._synced = np.zeros((count, 5))
+
+    def set_bodies(self, bodies: List[GameObject]):
+        """Take over the given objects, e.g. after a level load."""
+        for body in self.bodies:
+            body.physics_world = None
+        self.bodies = list(bodies)
+        self._allocate(len(self.bodies))
+        for index, body in enumerate(self.bodies):
+            body.physics_world = self
+            body.world_index = index
+            self.width[index] = body.rect.width
+            self.height[index] = body.rect.height
+            self.refresh_body(body)
+
+    def set_static_index(self, index: Optional[SpatialHash]):
+        """Use a level's static index to find the bodies that can hit nothing."""
+        self.static_index = index
+        if index is None:
+            self._static_table = None
+            return
+        cells = np.array(list(index.cells), dtype=np.int64).reshape(-1, 2)
+        origin = cells.min(axis=0) if len(cells) else np.zeros(2, dtype=np.int64)
+        size = cells.max(axis=0) - origin + 1 if len(cells) else np.zeros(2, dtype=np.int64)
+        occupied = np.zeros((size[0] + 1, size[1] + 1), dtype=np.int64)
+        occupied[cells[:, 0] - origin[0] + 1, cells[:, 1] - origin[1] + 1] = 1
+        # table[i, j] counts occupied cells in columns below i and rows below j
+        self._static_table = occupied.cumsum(axis=0).cumsum(axis=1)
+        self._static_origin = (int(origin[0]), int(origin[1]))
+
+    def refresh_body(self, body: GameObject):
+        """Re-read a body after code outside the world changed it."""
+        index = body.world_index
+        self.mass[index] = body.mass
+        self.gravity[index] = body.gravity
+        self.friction[index] = body.friction
+        self.collision_enabled[index] = body.collision_enabled
+        state = (body.rect.x, body.rect.y, body.velocity_x, body.velocity_y, body.on_ground)
+        self.x[index], self.y[index], self.velocity_x[index], self.velocity_y[index], self.on_ground[index] = state
+        self._synced[index] = state
+
+    def write_bodies(self, bodies: Sequence[GameObject]):
+        """Bring the objects the world is moving up to date, e.g. before contacts."""
+        active = self.active
+        self._write(np.array([body.world_index for body in bodies if active[body.world_index]], dtype=np.intp))
+
+    def read_bodies(self, bodies: Sequence[GameObject]):
+        """Take over positions and velocities after Python code moved the bodies, e.g. contacts."""
+        self._read(np.array([body.world_index for body in bodies], dtype=np.intp),
+                   [(body.rect.x, body.rect.y, body.velocity_x, body.velocity_y, body.on_ground)
+                    for body in bodies])
+
+    def _read(self, indices, state):
+        if not len(indices):
+            return
+        state = np.array(state, dtype=float)
+        self.x[indices] = state[:, 0]
+        self.y[indices] = state[:, 1]
+        self.velocity_x[indices] = state[:, 2]
+        self.velocity_y[indices] = state[:, 3]
+        self.on_ground[indices] = state[:, 4] != 0
+        self._synced[indices] = state
+
+    def write_positions(self):
+        """Move the rects of the bodies that moved, e.g. for the broadphase."""
+        synced = self._synced
+        moved = np.flatnonzero(self.active & ((self.x != synced[:, 0]) | (self.y != synced[:, 1])))
+        if not len(moved):
+            return
+        bodies = self.bodies
+        for index, x, y in zip(moved.tolist(), self.x[moved].tolist(), self.y[moved].tolist()):
+            bodies[index].rect.topleft = (int(x), int(y))
+        synced[moved, 0] = self.x[moved]
+        synced[moved, 1] = self.y[moved]
+
+    def push(self):
+        """Write positions and velocities back to the active objects that changed."""
+        synced = self._synced
+        changed = self.active & ((self.x != synced[:, 0]) | (self.y != synced[:, 1]) |
+                                 (self.velocity_x != synced[:, 2]) | (self.velocity_y != synced[:, 3]) |
+                                 (self.on_ground != (synced[:, 4] != 0)))
+        self._write(np.flatnonzero(changed))
+
+    def _write(self, indices):
+        if not len(indices):
+            return
+        bodies = self.bodies
+        state = zip(indices.tolist(), self.x[indices].tolist(), self.y[indices].tolist(),
+                    self.velocity_x[indices].tolist(), self.velocity_y[indices].tolist(),
+                    self.on_ground[indices].tolist())
+        for index, x, y, velocity_x, velocity_y, on_ground in state:
+            body = bodies[index]
+            body.rect.topleft = (int(x), int(y))
+            body.velocity_x = velocity_x
+            body.velocity_y = velocity_y
+            body.on_ground = on_ground
+        synced = self._synced
+        synced[indices, 0] = self.x[indices]
+        synced[indices, 1] = self.y[indices]
+        synced[indices, 2] = self.velocity_x[indices]
+        synced[indices, 3] = self.velocity_y[indices]
+        synced[indices, 4] = self.on_ground[indices]
+
+    def _set_active(self, awake: Sequence[GameObject]):
+        self.active[:] = False
+        self.active[[body.world_index for body in awake if not body.being_dragged]] = True
+
+    @staticmethod
+    def _round(values):
+        # pygame.Rect rounds half away from zero when assigned a float
+        return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5))
+
+    def integrate(self, awake: Sequence[GameObject]):
+        """Batched equivalent of GameObject.update for every awake, non-dragged body."""
+        self._set_active(awake)
+        active = self.active
+        on_ground = self.on_ground
+        vx = self.velocity_x
+        vy = self.velocity_y
+
+        # Gravity when airborne, friction when grounded (same formula as GameObject.update)
+        vy += np.where(active & ~on_ground, self.gravity, 0.0)
+        sliding = active & on_ground & (vx != 0)
+        speed = np.maximum(0.0, np.abs(vx) - self.friction * np.sign(vx))
+        vx[:] = np.where(sliding, speed * np.sign(vx), vx)
+
+        self.start_x[:] = self.x
+        self.start_y[:] = self.y
+        self.x[:] = np.where(active, self._round(self.x + vx), self.x)
+        self.y[:] = np.where(active, self._round(self.y + vy), self.y)
+
+        max_speed = self.cfg.physics.player.max_speed
+        np.minimum(vy, max_speed, out=vy, where=active)
+
+    def _near_static(self, indices):
+        """Which of the bodies may touch static geometry during their sweep."""
+        table = self._static_table
+        if table is None:
+            return np.ones(len(indices), dtype=bool)
+        # A static object the sweep can hit, or that the body can end up
+        # overlapping, shares a cell with the area swept from start to end
+        left = np.minimum(self.start_x[indices], self.x[indices])
+        top = np.minimum(self.start_y[indices], self.y[indices])
+        right = np.maximum(self.start_x[indices], self.x[indices]) + self.width[indices]
+        bottom = np.maximum(self.start_y[indices], self.y[indices]) + self.height[indices]
+        size = self.static_index.cell_size
+        origin_x, origin_y = self._static_origin
+        columns, rows = table.shape[0] - 1, table.shape[1] - 1
+        first_x = np.clip(left // size - origin_x, 0, columns).astype(np.int64)
+        last_x = np.clip((right - 1) // size - origin_x + 1, 0, columns).astype(np.int64)
+        first_y = np.clip(top // size - origin_y, 0, rows).astype(np.int64)
+        last_y = np.clip((bottom - 1) // size - origin_y + 1, 0, rows).astype(np.int64)
+        occupied = (table[last_x, last_y] - table[first_x, last_y] -
+                    table[last_x, first_y] + table[first_x, first_y])
+        return occupied > 0
+
+    def handle_collisions(self, physics, static_objects: List[GameObject]):
+        """Batched PhysicsSystem.handle_collisions for the bodies moved this tick.
+
+        Bodies with no static geometry around their sweep just leave the
+        ground. The rest are written out, resolved by PhysicsSystem and read
+        back, so collision response stays in one place.
+        """
+        indices = np.flatnonzero(self.active & self.collision_enabled)
+        if not len(indices):
+            return
+        near = self._near_static(indices)
+        clear = indices[~near]
+        self.on_ground[clear] = False
+        if self.static_index is not None:
+            # One query per axis that would have found nothing
+            physics.static_tests_avoided += 2 * len(static_objects) * len(clear)
+        indices = indices[near]
+        if not len(indices):
+            return
+        bodies = self.bodies
+        static_index = self.static_index
+        state = zip(indices.tolist(), self.start_x[indices].tolist(), self.start_y[indices].tolist(),
+                    self.x[indices].tolist(), self.y[indices].tolist(),
+                    self.velocity_x[indices].tolist(), self.velocity_y[indices].tolist(),
+                    self.on_ground[indices].tolist())
+        resolved = []
+        for index, start_x, start_y, x, y, velocity_x, velocity_y, on_ground in state:
+            body = bodies[index]
+            rect = body.rect
+            body.prev_x = int(start_x)
+            body.prev_y = int(start_y)
+            rect.topleft = (int(x), int(y))
+            body.velocity_x = velocity_x
+            body.velocity_y = velocity_y
+            body.on_ground = on_ground
+            physics.handle_collisions(body, static_objects, static_index)
+            resolved.append((rect.x, rect.y, body.velocity_x, body.velocity_y, body.on_ground))
+        self._read(indices, resolved)
+
+    def keep_in_bounds(self, awake: Sequence[GameObject]):
+        """Batched equivalent of PhysicsSystem.keep_in_bounds for awake, non-dragged bodies."""
+        self._set_active(awake)
+        if self.world_size is not None:
+            screen_width, screen_height = self.world_size
+        else:
+            screen_width = self.cfg.window.width
+            screen_height = self.cfg.window.height
+        x, y = self.x, self.y
+        right = x + self.width
+        bottom = y + self.height
+        solid = self.active & self.collision_enabled
+        ghost = self.active & ~self.collision_enabled
+
+        # Ghostly bodies only snap back to the centre once completely off screen
+        lost = ghost & ((right < 0) | (x > screen_width) | (bottom < 0) | (y > screen_height))
+        center_x = self._round(np.float64(screen_width / 2)) - self.width // 2
+        center_y = self._round(np.float64(screen_height / 2)) - self.height // 2
+
+        hit_left = solid & (x < 0)
+        hit_right = solid & ~hit_left & (right > screen_width)
+        hit_top = solid & (y < 0)
+        hit_bottom = solid & ~hit_top & (bottom > screen_height)
+
+        self.x[:] = np.select([lost, hit_left, hit_right], [center_x, 0, screen_width - self.width], x)
+        self.y[:] = np.select([lost, hit_top, hit_bottom], [center_y, 0, screen_height - self.height], y)
+        self.velocity_x[hit_left | hit_right] = 0
+        self.velocity_y[hit_top | hit_bottom] = 0
+        self.on_ground[hit_bottom] = True
@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Simulation phases, timed inside GameController.handle_events/update
+SIM_PHASES = ("events", "player", "integrate", "static", "pairs", "bounds", "sleep", "snapshot")
+# Render phases, timed on the thread that owns the window
+RENDER_PHASES = ("draw", "flip")
+PHASES = SIM_PHASES + RENDER_PHASES
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size ring buffer.
+
+    Code being timed calls lap() at phase boundaries; time is summed per
+    phase until end_frame() stores the frame, so several simulation ticks
+    in one frame add up. Phases may be timed on different threads (see
+    threaded simulation); the lock only guards the per-frame sums.
+    """
+
+    def __init__(self, capacity: int = 600, phases: Sequence[str] = PHASES):
+        self.capacity = max(1, capacity)
+        self.phases = tuple(phases)
+        # One column per phase plus the whole frame ("total"), in milliseconds
+        self.columns = self.phases + ("total",)
+        self.history: Dict[str, array] = {name: array('d', [0.0]) * self.capacity for name in self.columns}
+        self.index = 0  # Next slot to write
+        self.count = 0
+        self.frames = 0
+        self.lock = threading.Lock()
+        self._current = dict.fromkeys(self.phases, 0.0)
+        self._last_frame: Optional[float] = None
+
+    def lap(self, phase: str, start: float) -> float:
+        """Add the time since start to phase; return now, the start of the next phase."""
+        now = time.perf_counter()
+        with self.lock:
+            self._current[phase] += now - start
+        return now
+
+    def end_frame(self):
+        """Store the summed phase times of the frame that just finished."""
+        now = time.perf_counter()
+        with self.lock:
+            current, self._current = self._current, dict.fromkeys(self.phases, 0.0)
+        slot = self.index
+        for name, seconds in current.items():
+            self.history[name][slot] = seconds * 1000.0
+        frame = (now - self._last_frame) * 1000.0 if self._last_frame is not None else 0.0
+        self.history["total"][slot] = frame
+        self._last_frame = now
+        self.index = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+
+    def recent(self, name: str, frames: Optional[int] = None) -> List[float]:
+        """Stored values for a column, oldest first."""
+        count = self.count if frames is None else min(frames, self.count)
+        values = self.history[name]
+        start = (self.index - count) % self.capacity
+        if start + count <= self.capacity:
+            return values[start:start + count].tolist()
+        return values[start:].tolist() + values[:self.index].tolist()
+
+    def last(self, name: str) -> float:
+        if not self.count:
+            return 0.0
+        return self.history[name][(self.index - 1) % self.capacity]
+
+    def percentiles(self, name: str, points: Sequence[float] = (50, 95, 99)) -> Tuple[float, ...]:
+        """Nearest-rank percentiles of the stored values, in milliseconds."""
+        values = sorted(self.recent(name))
+        if not values:
+            return tuple(0.0 for _ in points)
+        last = len(values) - 1
+        return tuple(values[min(last, int(round(point / 100.0 * last)))] for point in points)
+
+    def mean(self, name: str, frames: int = 60) -> float:
+        values = self.recent(name, frames)
+        return sum(values) / len(values) if values else 0.0
+
+    def summary(self, threaded: bool) -> str:
+        """One-line simulation/render/frame comparison for the debug overlay."""
+        sim = sum(self.mean(name) for name in SIM_PHASES)
+        render = sum(self.mean(name) for name in RENDER_PHASES)
+        mode = "threaded" if threaded else "serial"
+        # Main-thread work per frame: simulation only counts when it runs there
+        busy = render if threaded else sim + render
+        return (f"Sim {sim:.1f} ms  Render {render:.1f} ms  "
+                f"Main thread {busy:.1f} ms  Frame {self.mean('total'):.1f} ms ({mode})")
+
+    def dump(self, path: str):
+        """Write the stored frames to path as CSV, or as JSON lines for a .jsonl path."""
+        first = self.frames - self.count
+        rows = zip(*(self.recent(name) for name in self.columns))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            if path.endswith(".jsonl"):
+                for number, row in enumerate(rows, first):
+                    record = {"frame": number}
+                    record.update((name, round(value, 4)) for name, value in zip(self.columns, row))
+                    f.write(json.dumps(record) + "\n")
+            else:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + self.columns)
+                for number, row in enumerate(rows, first):
+                    writer.writerow([number] + [f"{value:.4f}" for value in row])
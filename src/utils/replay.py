@@ -0,0 +1,251 @@
+"""Deterministic input recording, world-state hashing and high-speed replay."""
+import gzip
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+import pygame
+from src.utils.constants import TICK_RATE
+from src.utils.input_source import InputSource, KeyState
+from src.utils.settings_manager import SettingsManager
+
+REPLAY_VERSION = 1
+
+# Event types the game reacts to; everything else is left out of recordings
+RECORDED_EVENTS = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN)
+
+
+def hash_world_state(game) -> int:
+    """CRC32 of everything that affects the simulation from here on."""
+    crc = zlib.crc32(struct.pack('<iB', game.level_manager.current_level, game.game_state.value))
+    player = game.player
+    crc = zlib.crc32(struct.pack('<4i2dBi', *player.rect, player.velocity_x, player.velocity_y,
+                                 player.on_ground, player.current_modifier_index), crc)
+    for modifier in player.active_modifiers:
+        crc = zlib.crc32(modifier.effect_type.encode(), crc)
+    for obj in game.dynamic_objects:
+        crc = zlib.crc32(struct.pack('<4i2d3B', *obj.rect, obj.velocity_x, obj.velocity_y,
+                                     obj.on_ground, obj.sleeping, obj.being_dragged), crc)
+        for modifier in obj.active_modifiers:
+            crc = zlib.crc32(modifier.effect_type.encode(), crc)
+    return crc
+
+
+def config_checksum(settings: SettingsManager) -> int:
+    """Checksum of the active settings; replays only match under the same config."""
+    return zlib.crc32(json.dumps(settings.to_dict(), sort_keys=True, default=str).encode())
+
+
+def tracked_keys(settings: SettingsManager) -> List[int]:
+    """Keys whose held state is recorded each tick: every bound control."""
+    return sorted({key for key in settings.get("controls", default={}).values() if isinstance(key, int)})
+
+
+class RecordingInputSource(InputSource):
+    """Wraps another input source and records everything the game reads from it.
+
+    Each tick stores the held state of the control keys, the mouse position
+    if it was read, the events handled before the tick, and (via
+    record_hash) the world hash after it.
+    """
+
+    def __init__(self, inner: InputSource, keys: List[int], level: int = 0, start_tick: int = 0):
+        self.inner = inner
+        self.keys = keys
+        self.level = level
+        self.start_tick = start_tick
+        self.current_tick = start_tick - 1
+        self.next_tick = start_tick
+        self.ticks: Dict[int, list] = {}
+
+    def _entry(self, tick: int) -> list:
+        # [key bitmask, world hash, mouse position, events]
+        entry = self.ticks.get(tick)
+        if entry is None:
+            entry = self.ticks[tick] = [0, None, None, []]
+        return entry
+
+    def begin_tick(self, tick: int):
+        self.current_tick = tick
+        self.next_tick = tick + 1
+        self.inner.begin_tick(tick)
+
+    def get_events(self) -> List[pygame.event.Event]:
+        events = self.inner.get_events()
+        recorded = self._entry(self.next_tick)[3]
+        for event in events:
+            if event.type not in RECORDED_EVENTS:
+                continue
+            if event.type == pygame.KEYDOWN:
+                recorded.append([event.type, event.key])
+            elif event.type == pygame.QUIT:
+                recorded.append([event.type])
+            else:
+                recorded.append([event.type, event.pos[0], event.pos[1], event.button])
+        return events
+
+    def get_pressed(self):
+        keys = self.inner.get_pressed()
+        mask = 0
+        for bit, key in enumerate(self.keys):
+            if keys[key]:
+                mask |= 1 << bit
+        self._entry(self.current_tick)[0] = mask
+        return keys
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        pos = self.inner.get_mouse_pos()
+        self._entry(self.current_tick)[2] = [pos[0], pos[1]]
+        return pos
+
+    def record_hash(self, game):
+        """Tick listener: store the world hash after each simulated tick."""
+        self._entry(game.tick - 1)[1] = hash_world_state(game)
+
+    def save(self, path: str, settings: SettingsManager):
+        """Write the recording as gzip-compressed JSON."""
+        last_tick = max(self.ticks) if self.ticks else self.start_tick - 1
+        ticks = []
+        for tick in range(self.start_tick, last_tick + 1):
+            mask, world_hash, mouse, events = self.ticks.get(tick, [0, None, None, []])
+            # Drop empty trailing fields to keep idle ticks to two numbers
+            entry = [mask, world_hash, mouse, events]
+            while len(entry) > 2 and not entry[-1]:
+                entry.pop()
+            ticks.append(entry)
+        data = {
+            "version": REPLAY_VERSION,
+            "level": self.level,
+            "start_tick": self.start_tick,
+            "tick_rate": TICK_RATE,
+            "config_checksum": config_checksum(settings),
+            "keys": self.keys,
+            "ticks": ticks
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(path, 'wt') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+
+def load_recording(path: str) -> dict:
+    """Read a recording written by RecordingInputSource.save."""
+    with gzip.open(path, 'rt') as f:
+        data = json.load(f)
+    if data.get("version") != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {data.get('version')} in {path}")
+    return data
+
+
+class ReplayInputSource(InputSource):
+    """Feeds a recording back to the game tick by tick."""
+
+    def __init__(self, recording: dict):
+        self.keys = recording["keys"]
+        self.start_tick = recording["start_tick"]
+        self.ticks = recording["ticks"]
+        self.next_tick = self.start_tick
+        self.events_handed_out = self.start_tick - 1
+        self.key_state = KeyState()
+        self.mouse_pos = (0, 0)
+
+    def _entry(self, tick: int) -> Optional[list]:
+        index = tick - self.start_tick
+        if 0 <= index < len(self.ticks):
+            return self.ticks[index]
+        return None
+
+    def begin_tick(self, tick: int):
+        self.next_tick = tick + 1
+        entry = self._entry(tick)
+        mask = entry[0] if entry else 0
+        self.key_state = KeyState(key for bit, key in enumerate(self.keys) if mask & (1 << bit))
+        if entry and len(entry) > 2 and entry[2]:
+            self.mouse_pos = tuple(entry[2])
+
+    def get_events(self) -> List[pygame.event.Event]:
+        # Events are handed out once per tick, like pygame.event.get()
+        if self.events_handed_out == self.next_tick:
+            return []
+        self.events_handed_out = self.next_tick
+        entry = self._entry(self.next_tick)
+        if not entry or len(entry) < 4 or not entry[3]:
+            return []
+        events = []
+        for recorded in entry[3]:
+            event_type = recorded[0]
+            if event_type == pygame.KEYDOWN:
+                events.append(pygame.event.Event(event_type, key=recorded[1]))
+            elif event_type == pygame.QUIT:
+                events.append(pygame.event.Event(event_type))
+            else:
+                events.append(pygame.event.Event(event_type, pos=(recorded[1], recorded[2]), button=recorded[3]))
+        return events
+
+    def get_pressed(self):
+        return self.key_state
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.mouse_pos
+
+    @property
+    def last_tick(self) -> int:
+        return self.start_tick + len(self.ticks) - 1
+
+
+def start_recording(game) -> RecordingInputSource:
+    """Route a game's input through a recorder from the current tick on."""
+    recorder = RecordingInputSource(game.input, tracked_keys(game.settings),
+                                    level=game.level_manager.current_level, start_tick=game.tick)
+    game.set_input_source(recorder)
+    game.tick_listeners.append(recorder.record_hash)
+    return recorder
+
+
+def replay(game, recording: dict, until_tick: Optional[int] = None, verify: bool = True) -> dict:
+    """Run a recording through game.update at uncapped speed.
+
+    The game must be freshly created (tick 0, no input consumed yet). It is
+    moved to the recorded level and stepped until the recording ends,
+    until_tick is reached, or, when verify is set, the world hash first
+    differs from the recorded one.
+    """
+    if config_checksum(game.settings) != recording.get("config_checksum"):
+        print("Warning: config.json differs from the one used for this recording; expect divergence.")
+
+    source = ReplayInputSource(recording)
+    game.tick = recording["start_tick"]
+    game.level_manager.current_level = recording["level"]
+    game.load_current_level()
+    game.set_input_source(source)
+
+    last_tick = source.last_tick if until_tick is None else min(until_tick, source.last_tick)
+    diverged_at = None
+    expected = actual = None
+    start_time = time.perf_counter()
+    while game.tick <= last_tick:
+        tick = game.tick
+        if not game.handle_events():
+            break
+        game.step()
+        recorded_hash = source.ticks[tick - source.start_tick][1]
+        if verify and recorded_hash is not None:
+            world_hash = hash_world_state(game)
+            if world_hash != recorded_hash:
+                diverged_at, expected, actual = tick, recorded_hash, world_hash
+                break
+    elapsed = time.perf_counter() - start_time
+
+    ticks = game.tick - recording["start_tick"]
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed > 0 else float('inf'),
+        "diverged_at": diverged_at,
+        "expected_hash": expected,
+        "actual_hash": actual,
+        "final_hash": hash_world_state(game)
+    }
@@ -0,0 +1,153 @@
+"""Replay recorded playthroughs in parallel and check them against golden hashes.
+
+Run from the project root:
+    python -m src.utils.replay_runner [--dir src/replays] [--jobs N] [--bless]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+GOLDEN_FILE = "golden.json"
+REPLAY_EXTENSION = ".replay"
+
+
+def _init_worker():
+    # Workers never open a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # SDL otherwise turns SIGTERM into a quit event and the worker never exits
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+    import pygame
+    pygame.init()
+
+
+def run_one(job: tuple) -> dict:
+    """Replay one recording headless and compare its hashes."""
+    path, golden, interval, bless = job
+    from src.controllers.game_controller import GameController
+    from src.utils.replay import hash_world_state, load_recording, replay
+
+    name = os.path.basename(path)
+    try:
+        recording = load_recording(path)
+        game = GameController(headless=True)
+        checkpoints: Dict[int, int] = {}
+
+        def record_checkpoint(game):
+            tick = game.tick - 1
+            if (tick - recording["start_tick"]) % interval == 0:
+                checkpoints[tick] = hash_world_state(game)
+
+        game.tick_listeners.append(record_checkpoint)
+        # Without golden values the hashes stored in the recording are the reference.
+        # Blessing accepts whatever the game does now, so it always runs to the end
+        result = replay(game, recording, verify=golden is None and not bless)
+    except Exception as e:
+        return {"name": name, "ok": False, "error": str(e), "seconds": 0.0, "ticks": 0}
+
+    outcome = {
+        "name": name,
+        "ok": result["diverged_at"] is None,
+        "ticks": result["ticks"],
+        "seconds": result["seconds"],
+        "diverged_at": result["diverged_at"],
+        "final_hash": result["final_hash"],
+        "checkpoints": {str(tick): value for tick, value in sorted(checkpoints.items())}
+    }
+    if golden is not None:
+        for tick, expected in sorted(golden.get("checkpoints", {}).items(), key=lambda item: int(item[0])):
+            actual = checkpoints.get(int(tick))
+            if actual != expected:
+                outcome.update(ok=False, diverged_at=int(tick), expected_hash=expected, actual_hash=actual)
+                break
+        else:
+            if result["final_hash"] != golden.get("final_hash"):
+                outcome.update(ok=False, diverged_at=game.tick - 1,
+                               expected_hash=golden.get("final_hash"), actual_hash=result["final_hash"])
+    elif not outcome["ok"]:
+        outcome.update(expected_hash=result["expected_hash"], actual_hash=result["actual_hash"])
+    return outcome
+
+
+def find_replays(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(REPLAY_EXTENSION))
+
+
+def load_golden(directory: str) -> dict:
+    path = os.path.join(directory, GOLDEN_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_golden(directory: str, results: List[dict]):
+    golden = load_golden(directory)
+    for result in results:
+        if "error" not in result:
+            golden[result["name"]] = {"final_hash": result["final_hash"], "checkpoints": result["checkpoints"]}
+    with open(os.path.join(directory, GOLDEN_FILE), 'w') as f:
+        json.dump(golden, f, indent=4, sort_keys=True)
+
+
+def run_all(directory: str, jobs: Optional[int] = None, interval: int = 60, bless: bool = False) -> int:
+    """Replay every recording in directory; return the number of failures."""
+    paths = find_replays(directory)
+    if not paths:
+        print(f"No {REPLAY_EXTENSION} files found in {directory}")
+        return 0
+
+    golden = {} if bless else load_golden(directory)
+    work = [(path, golden.get(os.path.basename(path)), interval, bless) for path in paths]
+
+    start_time = time.perf_counter()
+    results = []
+    with multiprocessing.Pool(processes=jobs, initializer=_init_worker) as pool:
+        for result in pool.imap_unordered(run_one, work):
+            results.append(result)
+            if "error" in result:
+                print(f"ERROR {result['name']}: {result['error']}")
+            elif result["ok"]:
+                print(f"PASS  {result['name']}: {result['ticks']} ticks in {result['seconds']:.2f}s")
+            else:
+                expected = result.get("expected_hash")
+                actual = result.get("actual_hash")
+                print(f"FAIL  {result['name']}: diverged at tick {result['diverged_at']} "
+                      f"(expected {expected}, got {actual}) after {result['seconds']:.2f}s")
+        pool.close()
+        pool.join()
+    elapsed = time.perf_counter() - start_time
+
+    failures = [result for result in results if not result["ok"]]
+    total_ticks = sum(result["ticks"] for result in results)
+    replay_seconds = sum(result["seconds"] for result in results)
+    print(f"\n{len(results) - len(failures)} passed, {len(failures)} failed: "
+          f"{total_ticks} ticks replayed in {elapsed:.2f}s wall clock ({replay_seconds:.2f}s summed)")
+
+    if bless:
+        save_golden(directory, results)
+        print(f"Updated golden hashes in {os.path.join(directory, GOLDEN_FILE)}")
+        return len([result for result in results if "error" in result])
+    return len(failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run golden replay regression tests")
+    parser.add_argument("--dir", default=os.path.join("src", "replays"),
+                        help="directory containing .replay recordings and golden.json")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--interval", type=int, default=60, help="ticks between checkpoint hashes")
+    parser.add_argument("--bless", action="store_true",
+                        help="accept current results as the new golden hashes")
+    args = parser.parse_args()
+    sys.exit(1 if run_all(args.dir, args.jobs, args.interval, args.bless) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,165 @@
 import json
 import os
+import threading
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 import pygame
-from typing import Any, Dict
+
+# A settings key path, e.g. ("physics", "player", "max_speed")
+KeyPath = Tuple[str, ...]
+
+def _freeze(value: Any) -> Any:
+    """Turn nested dicts/lists into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze, giving plain dicts and lists (e.g. for JSON)."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _changed_paths(old: Any, new: Any, prefix: KeyPath = ()) -> List[KeyPath]:
+    """Key paths of the leaves that differ between two settings mappings."""
+    if not (isinstance(old, MappingProxyType) and isinstance(new, MappingProxyType)):
+        return [] if old == new else [prefix]
+    changed = []
+    for key in old.keys() | new.keys():
+        if key not in old or key not in new:
+            changed.append(prefix + (key,))
+        else:
+            changed.extend(_changed_paths(old[key], new[key], prefix + (key,)))
+    return changed
+
+
+def path_changed(changed: FrozenSet[KeyPath], *keys: str) -> bool:
+    """Check whether any changed key path lies at or below the given keys."""
+    depth = len(keys)
+    return any(path[:depth] == keys or keys[:len(path)] == path for path in changed)
+
+
+class SettingsView:
+    """Frozen attribute tree compiled from settings, for per-frame reads.
+
+    Every mapping becomes an instance of a slotted class, so hot paths read
+    e.g. cfg.physics.player.max_speed without walking dicts or catching
+    KeyError. Keys that are not known up front (like a modifier name) can
+    use view[key] or view.get(key, default).
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"Settings view is read-only (tried to set '{name}')")
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+# Slotted view classes, reused for every mapping with the same keys
+_view_classes: Dict[Tuple[str, ...], type] = {}
+
+
+def compile_settings(settings: Any, name: str = "settings") -> SettingsView:
+    """Build a SettingsView tree from a (frozen or plain) settings mapping."""
+    keys = tuple(settings)
+    cls = _view_classes.get(keys)
+    if cls is None:
+        class_name = "".join(part.title() for part in name.split("_")) + "View"
+        cls = _view_classes[keys] = type(class_name, (SettingsView,), {"__slots__": keys})
+    view = object.__new__(cls)
+    for key, value in settings.items():
+        if isinstance(value, (dict, MappingProxyType)):
+            value = compile_settings(value, key)
+        elif isinstance(value, list):
+            value = _freeze(value)
+        object.__setattr__(view, key, value)
+    return view
+
+
+class _ConfigSnapshot:
+    """Parsed settings shared by every SettingsManager reading the same file."""
+    __slots__ = ("path", "stamp", "settings", "view", "subscribers")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stamp: Optional[Tuple[int, int]] = None
+        self.settings: MappingProxyType = MappingProxyType({})
+        # Compiled lazily on first access to SettingsManager.compiled
+        self.view: Optional[SettingsView] = None
+        # Zero-argument callables returning the callback, or None once it was collected
+        self.subscribers: List[Callable[[], Optional[Callable]]] = []
+
+
+# One snapshot per config file for the whole process
+_snapshots: Dict[str, _ConfigSnapshot] = {}
+_snapshots_lock = threading.Lock()
+# Resolved config paths by (working directory, config_dir); every GameObject
+# creates a SettingsManager, so level loads would otherwise spend much of
+# their time in os.path.abspath
+_config_paths: Dict[Tuple[str, str], str] = {}
+
 
 class SettingsManager:
+    """Read access to config.json.
+
+    The file is parsed once per process; every instance shares the same
+    frozen snapshot, so creating a SettingsManager costs no disk I/O.
+    reload_if_changed() re-reads the file only when its mtime changed.
+    """
+
     def __init__(self, config_dir: str = "src/config"):
         self.config_dir = config_dir
-        self.settings: Dict[str, Any] = {}
-        self._load_settings()
+        key = (os.getcwd(), config_dir)
+        config_path = _config_paths.get(key)
+        if config_path is None:
+            config_path = _config_paths[key] = os.path.abspath(os.path.join(config_dir, "config.json"))
+        self.config_path = config_path
+        # Private copy made by set(); None while reading the shared snapshot
+        self._overrides: Optional[MappingProxyType] = None
+        self._overrides_view: Optional[SettingsView] = None
+        with _snapshots_lock:
+            snapshot = _snapshots.get(self.config_path)
+            if snapshot is None:
+                snapshot = _snapshots[self.config_path] = _ConfigSnapshot(self.config_path)
+                self._load_settings(snapshot)
+        self._snapshot = snapshot
+
+    @property
+    def settings(self) -> MappingProxyType:
+        if self._overrides is not None:
+            return self._overrides
+        return self._snapshot.settings
+
+    @property
+    def compiled(self) -> SettingsView:
+        """Attribute-access view of the current settings, built once per snapshot."""
+        if self._overrides is not None:
+            if self._overrides_view is None:
+                self._overrides_view = compile_settings(self._overrides)
+            return self._overrides_view
+        snapshot = self._snapshot
+        view = snapshot.view
+        if view is None:
+            view = snapshot.view = compile_settings(snapshot.settings)
+        return view
 
     def _create_default_config(self) -> Dict[str, Any]:
         """Create default configuration dictionary."""
@@ -16,7 +168,11 @@ class SettingsManager:
                 "width": 800,
                 "height": 600,
                 "title": "Modifier Mallet",
-                "fps": 60
+                "fps": 60,
+                "dirty_rects": False,  # Update only changed screen areas instead of flipping the whole frame
+                "batch_rendering": True,  # Draw dynamic objects from a pre-rendered atlas in one blits call
+                "threaded_simulation": False,  # Simulate on a worker thread while the main thread renders
+                "cull_margin": 64  # Pixels around the view in which dynamic objects are still drawn
             },
             "colors": {
                 "background": [0, 0, 0],
@@ -34,37 +190,50 @@ class SettingsManager:
                 }
             },
             "physics": {
-                "gravity": 0.7,  # Slightly reduced from original
+                "gravity": 1.4,  # Per tick; velocities move bodies once per step
+                "broadphase_cell_size": 64,  # Spatial hash cell size in pixels
+                "max_catchup_steps": 5,  # Steps allowed per rendered frame before dropping time
+                "use_physics_world": False,  # Batch-integrate dynamic objects with NumPy
+                "sleep": {
+                    "enabled": True,
+                    "velocity_threshold": 0.5,  # Below this speed an object counts as still
+                    "frames": 30  # Still frames before an object falls asleep
+                },
                 "player": {
-                    "acceleration": 0.4,  # More gradual acceleration
-                    "deceleration": 0.4,  # Matching deceleration for smooth feel
-                    "air_acceleration": 0.15,  # Reduced air control
-                    "max_speed": 5.5,  # Slightly lower top speed
-                    "jump_force": -13,  # Adjusted for new gravity
+                    "acceleration": 0.8,  # More gradual acceleration
+                    "deceleration": 0.8,  # Matching deceleration for smooth feel
+                    "air_acceleration": 0.3,  # Reduced air control
+                    "max_speed": 11,  # Slightly lower top speed
+                    "jump_force": -26,  # Adjusted for new gravity
                     "mass": 1.0
                 },
                 "object": {
                     "default_mass": 1.0,
-                    "default_friction": 0.5,
+                    "default_friction": 1.0,
                     "default_elasticity": 0.2,
-                    "push_force_scale": 0.8  # New: scales force applied when pushing objects
+                    "push_force_scale": 0.8,  # New: scales force applied when pushing objects
+                    "friction": 0.8  # Horizontal speed the player keeps per frame while standing on an object
                 },
                 "modifiers": {
                     "bouncy_elasticity": 0.9,
                     "heavy_mass_multiplier": 5,
                     "floaty_gravity_scale": 0.1,
-                    "sticky_drag_force": 10,
+                    "sticky_drag_force": 20,
                     "ghostly_alpha": 128
                 }
             },
             "mallet": {
                 "range": 100,
                 "cooldown": 0.5,
-                "hit_force": 5
+                "hit_force": 10
             },
             "game": {
                 "max_active_modifiers": 3,
-                "level_directory": "levels/"
+                "level_directory": "levels/",
+                "merge_static_tiles": True,  # Merge ASCII wall tiles into larger colliders
+                "config_poll_interval": 0.5,  # Seconds between config.json change checks; 0 disables hot-reload
+                "tile_size": 0,  # Pixels per ASCII level cell; 0 stretches the grid to the window
+                "level_cache": True  # Load levels from compiled copies in __levelcache__ when current
             },
             "ui": {
                 "font_name": None,
@@ -80,7 +249,12 @@ class SettingsManager:
             },
             "debug": {
                 "draw_colliders": False,
-                "show_fps": True
+                "show_fps": True,
+                "show_broadphase_stats": False,
+                "show_timings": False,  # Simulation/render milliseconds per frame
+                "show_profiler": False,  # Per-phase percentile overlay (toggle in game with controls.toggle_profiler)
+                "profiler_history": 600,  # Frames kept by the profiler
+                "profile_dump": ""  # Write profiler frames here on exit (.csv or .jsonl)
             },
             "controls": {
                 "move_left": pygame.K_LEFT,
@@ -89,25 +263,78 @@ class SettingsManager:
                 "cycle_mod_next": pygame.K_e,
                 "cycle_mod_prev": pygame.K_q,
                 "reset_level": pygame.K_r,
-                "pause": pygame.K_ESCAPE
+                "pause": pygame.K_ESCAPE,
+                "cycle_cooldown": 0.15,  # Seconds between modifier cycles while Q/E is held
+                "toggle_profiler": pygame.K_F3
             }
         }
 
-    def _load_settings(self):
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_settings(self, snapshot: _ConfigSnapshot):
         """Load settings from config file, create default if doesn't exist."""
-        self.settings = self._create_default_config()
+        settings = self._create_default_config()
         
-        config_path = os.path.join(self.config_dir, "config.json")
-        if os.path.exists(config_path):
+        config_path = self.config_path
+        snapshot.stamp = self._file_stamp()
+        if snapshot.stamp is not None:
             try:
                 with open(config_path, 'r') as f:
                     user_settings = json.load(f)
                     # Deep update of settings with user values
-                    self._deep_update(self.settings, user_settings)
+                    self._deep_update(settings, user_settings)
             except json.JSONDecodeError:
                 print("Warning: Invalid config.json file. Using default settings.")
             except Exception as e:
                 print(f"Warning: Error loading config file: {e}")
+        # Swapped in with a single assignment so readers never see a partial update
+        snapshot.settings = _freeze(settings)
+        snapshot.view = None
+
+    def reload_if_changed(self) -> bool:
+        """Re-read config.json if it changed on disk; return whether it did.
+
+        Subscribers are notified with the key paths whose values changed,
+        so they only recompute what depends on those values.
+        """
+        snapshot = self._snapshot
+        if self._file_stamp() == snapshot.stamp:
+            return False
+        with _snapshots_lock:
+            if self._file_stamp() == snapshot.stamp:
+                return False
+            old_settings = snapshot.settings
+            self._load_settings(snapshot)
+            changed = frozenset(_changed_paths(old_settings, snapshot.settings))
+            callbacks = [ref() for ref in snapshot.subscribers]
+            snapshot.subscribers = [ref for ref, callback in zip(snapshot.subscribers, callbacks)
+                                    if callback is not None]
+        if changed:
+            for callback in callbacks:
+                if callback is not None:
+                    callback(changed)
+        return True
+
+    def subscribe(self, callback: Callable[[FrozenSet[KeyPath]], None]):
+        """Call callback(changed_paths) after each reload that changed values.
+
+        Bound methods are held weakly, so subscribing does not keep short-lived
+        objects such as a level's player alive.
+        """
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with _snapshots_lock:
+            snapshot = self._snapshot
+            # Drop subscribers that were garbage collected, e.g. previous levels' players
+            snapshot.subscribers = [existing for existing in snapshot.subscribers if existing() is not None]
+            snapshot.subscribers.append(ref)
 
     def _deep_update(self, d: dict, u: dict) -> None:
         """Recursively update nested dictionary with another dictionary."""
@@ -123,7 +350,7 @@ class SettingsManager:
         config_path = os.path.join(self.config_dir, "config.json")
         try:
             with open(config_path, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+                json.dump(self.to_dict(), f, indent=4)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
@@ -148,10 +375,18 @@ class SettingsManager:
         if not keys:
             return
 
-        current = self.settings
+        settings = self.to_dict()
+        current = settings
         for key in keys[:-1]:
             if key not in current or not isinstance(current[key], dict):
                 current[key] = {}
             current = current[key]
         
-        current[keys[-1]] = value
\ No newline at end of file
+        current[keys[-1]] = value
+        # Copy-on-write: the shared snapshot stays untouched
+        self._overrides = _freeze(settings)
+        self._overrides_view = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy of the current settings."""
+        return _thaw(self.settings)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import pygame
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Marks unused atlas pixels; chosen so no configured object color hits it by accident
+ATLAS_COLORKEY = (254, 0, 254)
+FLOATY_PHASES = 20
+
+
+class ObjectAtlas:
+    """Pre-rendered object looks packed onto shared atlas pages.
+
+    Each distinct look (size, body color, modifiers, animation phase) is drawn
+    once with the object's own draw() and reused by every object and frame
+    that looks the same. Pages are packed in shelves (rows of entries).
+    """
+
+    def __init__(self, page_size: int = 1024, max_pages: int = 8):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages: List[pygame.Surface] = []
+        # look -> (page, area on the page, offset of the object rect within the area)
+        self.entries: Dict[tuple, Tuple[pygame.Surface, pygame.Rect, Tuple[int, int]]] = {}
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+
+    def clear(self):
+        """Forget every entry, e.g. after colors or outline settings changed."""
+        self.pages = []
+        self.entries = {}
+        self._shelf_x = self._shelf_y = self._shelf_height = 0
+
+    def _new_page(self) -> pygame.Surface:
+        page = pygame.Surface((self.page_size, self.page_size))
+        if pygame.display.get_surface() is not None:
+            page = page.convert()
+        page.fill(ATLAS_COLORKEY)
+        page.set_colorkey(ATLAS_COLORKEY)
+        self.pages.append(page)
+        self._shelf_x = self._shelf_y = self._shelf_height = 0
+        return page
+
+    def _allocate(self, width: int, height: int) -> Optional[Tuple[pygame.Surface, pygame.Rect]]:
+        if width > self.page_size or height > self.page_size:
+            return None
+        if not self.pages:
+            self._new_page()
+        if self._shelf_x + width > self.page_size:
+            # Start a new shelf below the current one
+            self._shelf_y += self._shelf_height
+            self._shelf_x = 0
+            self._shelf_height = 0
+        if self._shelf_y + height > self.page_size:
+            if len(self.pages) >= self.max_pages:
+                # Full: start over rather than grow without bound
+                self.clear()
+            self._new_page()
+        area = pygame.Rect(self._shelf_x, self._shelf_y, width, height)
+        self._shelf_x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return self.pages[-1], area
+
+    def get(self, obj, look_of: Callable[[object], tuple]) -> Optional[Tuple[pygame.Surface, pygame.Rect, Tuple[int, int]]]:
+        """Return the atlas entry for obj's current look, rendering it if new."""
+        look = look_of(obj)
+        entry = self.entries.get(look)
+        if entry is not None:
+            return entry
+        rect = obj.rect
+        bounds = obj.get_draw_bounds(rect)
+        slot = self._allocate(bounds.width, bounds.height)
+        if slot is None:
+            return None
+        page, area = slot
+        offset = (rect.x - bounds.x, rect.y - bounds.y)
+        # Draw the object at its slot with its normal draw code
+        page.fill(ATLAS_COLORKEY, area)
+        page.set_clip(area)
+        obj.rect = rect.move(area.x + offset[0] - rect.x, area.y + offset[1] - rect.y)
+        try:
+            obj.draw(page)
+        finally:
+            obj.rect = rect
+            page.set_clip(None)
+        entry = (page, area, offset)
+        # An animation phase may have ticked over while drawing; only keep
+        # entries whose look is certain
+        if look_of(obj) == look:
+            self.entries[look] = entry
+        return entry
+
+
+class BatchRenderer:
+    """Collects object draws for a frame and submits them with one Surface.blits call."""
+
+    def __init__(self):
+        self.atlas = ObjectAtlas()
+        self.commands: List[tuple] = []
+        self.draw_calls = 0
+
+    @staticmethod
+    def look(obj) -> tuple:
+        """Everything that decides how a plain GameObject is drawn."""
+        modifiers = tuple(modifier.effect_type for modifier in obj.active_modifiers)
+        # Floaty particles cycle with time (see GameObject.draw)
+        phase = (pygame.time.get_ticks() // 100) % FLOATY_PHASES if "floaty" in modifiers else 0
+        return (obj.rect.width, obj.rect.height, obj.color, modifiers, phase)
+
+    def add(self, screen: pygame.Surface, obj, render_rect: pygame.Rect):
+        """Queue obj to be drawn at render_rect."""
+        rect = obj.rect
+        obj.rect = render_rect
+        try:
+            entry = self.atlas.get(obj, self.look)
+            if entry is None:
+                # Too large for the atlas: draw directly, after what is queued
+                self.flush(screen)
+                obj.draw(screen)
+                self.draw_calls += 1
+                return
+        finally:
+            obj.rect = rect
+        page, area, offset = entry
+        self.commands.append((page, (render_rect.x - offset[0], render_rect.y - offset[1]), area))
+
+    def flush(self, screen: pygame.Surface):
+        """Submit the queued draws in one call."""
+        if self.commands:
+            screen.blits(self.commands, doreturn=False)
+            self.commands = []
+            self.draw_calls += 1
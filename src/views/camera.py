@@ -0,0 +1,49 @@
+import pygame
+from typing import Tuple
+
+class Camera:
+    """Scrolling view onto a level that may be larger than the window.
+
+    The camera follows its target once per simulation step, so where it looks
+    is part of the simulated state: mouse input is converted with it, and
+    replays stay deterministic. Drawing interpolates between its last two
+    positions like any other object.
+    """
+
+    def __init__(self, view_size: Tuple[int, int]):
+        self.width, self.height = view_size
+        self.world_width, self.world_height = view_size
+        self.x = 0
+        self.y = 0
+        self.prev_x = 0
+        self.prev_y = 0
+
+    def set_world_size(self, world_size: Tuple[int, int]):
+        self.world_width, self.world_height = world_size
+
+    def follow(self, rect: pygame.Rect):
+        """Center on rect, without showing anything outside the level."""
+        self.x = min(max(rect.centerx - self.width // 2, 0), max(0, self.world_width - self.width))
+        self.y = min(max(rect.centery - self.height // 2, 0), max(0, self.world_height - self.height))
+
+    def snap(self, rect: pygame.Rect):
+        """Jump to rect without interpolating from the old position, e.g. on level load."""
+        self.follow(rect)
+        self.store_render_state()
+
+    def store_render_state(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def get_render_offset(self, alpha: float) -> Tuple[int, int]:
+        """Top-left of the view between the previous and current step."""
+        return (round(self.prev_x + (self.x - self.prev_x) * alpha),
+                round(self.prev_y + (self.y - self.prev_y) * alpha))
+
+    def view_rect(self) -> pygame.Rect:
+        """World area visible at the current step."""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def to_world(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """Convert a screen position (mouse) to world coordinates."""
+        return (pos[0] + self.x, pos[1] + self.y)
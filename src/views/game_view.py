@@ -0,0 +1,87 @@
+import pygame
+from collections import OrderedDict
+from typing import Iterable, Tuple
+from src.utils.broadphase import SpatialHash
+from src.views.render_snapshot import ObjectSnapshot
+
+class StaticLayer:
+    """Level geometry pre-rendered in square chunks.
+
+    A chunk is rendered the first time it scrolls into view and blitted as
+    is afterwards, so a level many screens wide costs the same per frame as
+    one that fits the window. Only the objects the spatial index reports
+    for a chunk are drawn into it. Dirty-rect drawing also uses the layer to
+    erase moved objects.
+
+    Objects are copied on construction, so chunks can be rendered later on
+    the render thread while the simulation uses the originals. A new layer
+    is built on level load (or when its colors change) instead of redrawing
+    this one, so snapshots holding it stay valid.
+    """
+
+    def __init__(self, world_size: Tuple[int, int], background: Tuple[int, int, int], objects: Iterable,
+                 chunk_size: int = 512, max_chunks: int = 32):
+        self.world_width, self.world_height = world_size
+        self.background = background
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.index = SpatialHash.from_objects([ObjectSnapshot.of(obj) for obj in objects], chunk_size)
+        self.chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+
+    def _chunk(self, cx: int, cy: int) -> pygame.Surface:
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        size = self.chunk_size
+        area = pygame.Rect(cx * size, cy * size, size, size).clip(
+            pygame.Rect(0, 0, self.world_width, self.world_height))
+        chunk = pygame.Surface(area.size)
+        if pygame.display.get_surface() is not None:
+            # Match the display format so blits need no conversion
+            chunk = chunk.convert()
+        chunk.fill(self.background)
+        # Effects (bounce arrows) reach past an object's rect into neighbouring chunks
+        for obj in self.index.query(area.inflate(64, 64)):
+            rect = obj.rect
+            obj.rect = rect.move(-area.x, -area.y)
+            try:
+                obj.draw(chunk)
+            finally:
+                obj.rect = rect
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def _chunk_range(self, area: pygame.Rect) -> Tuple[range, range]:
+        size = self.chunk_size
+        area = area.clip(pygame.Rect(0, 0, self.world_width, self.world_height))
+        if not area:
+            return range(0), range(0)
+        return (range(area.left // size, (area.right - 1) // size + 1),
+                range(area.top // size, (area.bottom - 1) // size + 1))
+
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int]):
+        """Blit the chunks visible with the view's top-left at offset."""
+        ox, oy = offset
+        size = self.chunk_size
+        columns, rows = self._chunk_range(pygame.Rect(ox, oy, screen.get_width(), screen.get_height()))
+        for cy in rows:
+            for cx in columns:
+                screen.blit(self._chunk(cx, cy), (cx * size - ox, cy * size - oy))
+
+    def restore(self, screen: pygame.Surface, rect: pygame.Rect, offset: Tuple[int, int]):
+        """Erase a screen area back to the static level."""
+        ox, oy = offset
+        size = self.chunk_size
+        world_rect = rect.move(ox, oy)
+        columns, rows = self._chunk_range(world_rect)
+        for cy in rows:
+            for cx in columns:
+                chunk_x = cx * size
+                chunk_y = cy * size
+                area = world_rect.clip(pygame.Rect(chunk_x, chunk_y, size, size))
+                screen.blit(self._chunk(cx, cy), (area.x - ox, area.y - oy),
+                            area.move(-chunk_x, -chunk_y))
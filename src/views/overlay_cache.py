@@ -0,0 +1,32 @@
+import pygame
+from typing import Dict, Tuple
+
+class OverlayCache:
+    """Pre-filled, alpha-set surfaces for modifier effects.
+
+    One surface per (effect_type, size) is shared by every object and frame.
+    It is only re-created when the requested color or alpha changes.
+    """
+
+    def __init__(self):
+        self.surfaces: Dict[Tuple[str, Tuple[int, int]], Tuple[tuple, int, pygame.Surface]] = {}
+
+    def get(self, effect_type: str, size: Tuple[int, int], color: tuple, alpha: int) -> pygame.Surface:
+        key = (effect_type, (size[0], size[1]))
+        entry = self.surfaces.get(key)
+        if entry is not None and entry[0] == color and entry[1] == alpha:
+            return entry[2]
+        surface = pygame.Surface(key[1])
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.set_alpha(alpha)
+        surface.fill(color)
+        self.surfaces[key] = (color, alpha, surface)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# Shared by all game objects
+overlay_cache = OverlayCache()
@@ -0,0 +1,84 @@
+import pygame
+from typing import Optional
+from src.utils.profiler import FrameProfiler
+from src.views.text_renderer import text_renderer
+
+BACKGROUND = (30, 30, 30)
+TEXT_COLOR = (255, 255, 0)
+GRAPH_COLORS = ((0, 200, 0), (230, 200, 0), (230, 40, 40))  # Under 60 FPS budget, under 30, over
+
+
+class ProfilerOverlay:
+    """Table of per-phase p50/p95/p99 times and a scrolling frame-time graph.
+
+    The table is re-rendered every refresh_frames frames. The graph keeps its
+    own surface, scrolls it one pixel per frame and draws only the newest
+    column, so showing the overlay costs little compared to what it measures.
+    """
+
+    def __init__(self, width: int = 260, graph_height: int = 60, font_size: int = 18,
+                 refresh_frames: int = 15, graph_scale_ms: float = 50.0):
+        self.width = width
+        self.graph_height = graph_height
+        self.font_size = font_size
+        self.refresh_frames = refresh_frames
+        self.graph_scale_ms = graph_scale_ms
+        self.table: Optional[pygame.Surface] = None
+        self.graph: Optional[pygame.Surface] = None
+        self._table_frame = 0
+        self._graph_frame = 0
+
+    def _render_table(self, profiler: FrameProfiler) -> pygame.Surface:
+        line_height = self.font_size + 2
+        rows = [("phase", "p50", "p95", "p99")]
+        for name in profiler.columns:
+            rows.append((name,) + tuple(f"{value:.2f}" for value in profiler.percentiles(name)))
+        table = pygame.Surface((self.width, line_height * len(rows) + 4))
+        table.fill(BACKGROUND)
+        columns = (6, self.width - 150, self.width - 100, self.width - 50)
+        for i, row in enumerate(rows):
+            y = 2 + i * line_height
+            for x, text in zip(columns, row):
+                # Numbers change every refresh, so keep them out of the text cache
+                surface = text_renderer.render(text, self.font_size, TEXT_COLOR, cache=i == 0)
+                table.blit(surface, (x, y))
+        return table
+
+    def _update_graph(self, profiler: FrameProfiler):
+        if self.graph is None:
+            self.graph = pygame.Surface((self.width, self.graph_height))
+            self.graph.fill(BACKGROUND)
+            self._graph_frame = profiler.frames - min(profiler.count, self.width)
+        new_frames = min(profiler.frames - self._graph_frame, self.width)
+        if new_frames <= 0:
+            return
+        graph = self.graph
+        height = self.graph_height
+        graph.scroll(-new_frames, 0)
+        graph.fill(BACKGROUND, (self.width - new_frames, 0, new_frames, height))
+        budget_y = height - int(1000.0 / 60 / self.graph_scale_ms * height)
+        for i, frame_ms in enumerate(profiler.recent("total", new_frames)):
+            x = self.width - new_frames + i
+            if frame_ms <= 1000.0 / 60:
+                color = GRAPH_COLORS[0]
+            elif frame_ms <= 1000.0 / 30:
+                color = GRAPH_COLORS[1]
+            else:
+                color = GRAPH_COLORS[2]
+            bar = min(height, int(frame_ms / self.graph_scale_ms * height))
+            if bar > 0:
+                pygame.draw.line(graph, color, (x, height - 1), (x, height - bar))
+            # 60 FPS budget marker
+            graph.set_at((x, budget_y), (120, 120, 120))
+        self._graph_frame = profiler.frames
+
+    def draw(self, screen: pygame.Surface, profiler: FrameProfiler) -> pygame.Rect:
+        """Draw the overlay in the top-right corner; return the area it covers."""
+        if self.table is None or profiler.frames - self._table_frame >= self.refresh_frames:
+            self.table = self._render_table(profiler)
+            self._table_frame = profiler.frames
+        self._update_graph(profiler)
+        x = screen.get_width() - self.width - 10
+        table_rect = screen.blit(self.table, (x, 10))
+        graph_rect = screen.blit(self.graph, (x, table_rect.bottom))
+        return table_rect.union(graph_rect)
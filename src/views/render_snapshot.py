@@ -0,0 +1,147 @@
+import threading
+import pygame
+from typing import List, Optional, Tuple
+from src.models.game_object import GameObject
+from src.models.player import Player
+from src.models.sprite_manager import SpriteManager
+
+class ObjectSnapshot(GameObject):
+    """Copy of what GameObject.draw() reads, taken after a simulation step.
+
+    Created without running GameObject.__init__, so it is cheap and has no
+    physics state. The simulation never touches it after capture, so the
+    render thread can draw it while the live object keeps moving.
+    """
+
+    @classmethod
+    def of(cls, obj: GameObject) -> "ObjectSnapshot":
+        snapshot = cls.__new__(cls)
+        snapshot.source_id = id(obj)
+        snapshot.cfg = obj.cfg
+        snapshot.rect = obj.rect.copy()
+        snapshot.render_prev_x = obj.render_prev_x
+        snapshot.render_prev_y = obj.render_prev_y
+        snapshot.color = obj.color
+        snapshot.active_modifiers = tuple(obj.active_modifiers)
+        snapshot.sleeping = obj.sleeping
+        return snapshot
+
+
+class PlayerSnapshot(Player):
+    """Copy of what Player.draw() reads, including the animation frame."""
+
+    @classmethod
+    def of(cls, player: Player, sim_time: float) -> "PlayerSnapshot":
+        snapshot = cls.__new__(cls)
+        snapshot.source_id = id(player)
+        snapshot.cfg = player.cfg
+        snapshot.rect = player.rect.copy()
+        snapshot.render_prev_x = player.render_prev_x
+        snapshot.render_prev_y = player.render_prev_y
+        snapshot.color = player.color
+        snapshot.active_modifiers = tuple(player.active_modifiers)
+        snapshot.has_sprites = player.has_sprites
+        if player.has_sprites:
+            # Baked frames are shared read-only; only the frame counter is copied
+            sprites = SpriteManager.__new__(SpriteManager)
+            sprites.frames = player.sprite_manager.frames
+            sprites.state_frame_counts = player.sprite_manager.state_frame_counts
+            sprites.current_frame = player.sprite_manager.current_frame
+            snapshot.sprite_manager = sprites
+        snapshot.state = player.state
+        snapshot.facing_right = player.facing_right
+        snapshot.mallet_range = player.mallet_range
+        snapshot.modifier_types = player.modifier_types
+        snapshot.current_modifier_index = player.current_modifier_index
+        snapshot.modifier_cooldown = player.modifier_cooldown
+        snapshot.last_modifier_use = player.last_modifier_use
+        snapshot.get_time = lambda: sim_time
+        snapshot.hud_rect = None
+        return snapshot
+
+
+class RenderSnapshot:
+    """Everything one frame needs to be drawn.
+
+    capture() copies the player and dynamic objects for drawing on another
+    thread; with copy=False it refers to the live objects instead, for the
+    single-threaded loop. Only dynamic objects near the camera view are
+    included, found with a broadphase query.
+    """
+
+    __slots__ = ("tick", "due_time", "objects", "player", "camera", "static_layer",
+                 "level_title", "hints", "stats", "message")
+
+    def __init__(self, tick: int, due_time: float, objects: List[GameObject], player: Player,
+                 camera: Tuple[int, int, int, int], static_layer, level_title: Optional[str],
+                 hints: Tuple[str, ...], stats: Optional[str], message: Optional[str]):
+        self.tick = tick
+        # Wall-clock time at which the last simulated tick was due, for interpolation
+        self.due_time = due_time
+        self.objects = objects
+        self.player = player
+        # Camera (prev_x, prev_y, x, y), interpolated like the objects
+        self.camera = camera
+        self.static_layer = static_layer
+        self.level_title = level_title
+        self.hints = hints
+        self.stats = stats
+        self.message = message
+
+    @classmethod
+    def capture(cls, game, due_time: float = 0.0, copy: bool = True) -> "RenderSnapshot":
+        level_title = None
+        hints = ()
+        if game.current_level_data:
+            level_title = f"Level {game.level_manager.current_level + 1}: {game.current_level_data['name']}"
+            hints = tuple(game.current_level_data.get("hints", []))
+        stats = None
+        if game.cfg.debug.show_broadphase_stats:
+            objects = game.dynamic_objects
+            stats = (f"Static tests: {game.physics.static_tests} (skipped {game.physics.static_tests_avoided}) "
+                     f"Pairs: {game.dynamic_broadphase.pair_count} "
+                     f"Awake: {sum(not obj.sleeping for obj in objects)}/{len(objects)}")
+        camera = game.camera
+        # Cover the view at both ends of the interpolation, plus a margin for
+        # effects drawn outside object rects
+        visible = camera.view_rect().union(pygame.Rect(camera.prev_x, camera.prev_y, camera.width, camera.height))
+        margin = game.cfg.window.cull_margin
+        objects = game.dynamic_broadphase.query(visible.inflate(margin * 2, margin * 2))
+        if copy:
+            objects = [ObjectSnapshot.of(obj) for obj in objects]
+            player = PlayerSnapshot.of(game.player, game.player.get_time())
+        else:
+            player = game.player
+        return cls(game.tick, due_time, objects, player, (camera.prev_x, camera.prev_y, camera.x, camera.y),
+                   game.static_layer, level_title, hints, stats, game.message)
+
+
+class SnapshotBuffer:
+    """Double buffer between the simulation thread and the render thread.
+
+    The simulation publishes finished snapshots into the back slot; the
+    renderer swaps the newest one to the front and draws it. Snapshots are
+    never modified after publishing, so drawing needs no lock.
+    """
+
+    def __init__(self, snapshot: RenderSnapshot):
+        self.front = snapshot
+        self.back: Optional[RenderSnapshot] = None
+        self.lock = threading.Lock()
+        self.published = 0
+        # Published but replaced before the renderer got to them
+        self.skipped = 0
+
+    def publish(self, snapshot: RenderSnapshot):
+        with self.lock:
+            if self.back is not None:
+                self.skipped += 1
+            self.back = snapshot
+            self.published += 1
+
+    def latest(self) -> RenderSnapshot:
+        """Swap in the newest snapshot, or keep drawing the current one."""
+        with self.lock:
+            if self.back is not None:
+                self.front, self.back = self.back, None
+            return self.front
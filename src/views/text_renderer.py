@@ -0,0 +1,57 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class TextRenderer:
+    """Renders HUD text with cached fonts and an LRU cache of rendered surfaces.
+
+    Fonts are loaded once per (name, size). Rendered surfaces are kept per
+    (text, color, size, name), so text that does not change between frames
+    costs a dictionary lookup instead of a font render.
+    """
+
+    def __init__(self, max_surfaces: int = 256):
+        self.max_surfaces = max_surfaces
+        self.fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+        self.surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        """Return the font for (name, size), loading it on first use."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text: str, size: int, color: Tuple[int, ...], name: Optional[str] = None,
+               cache: bool = True) -> pygame.Surface:
+        """Return an antialiased surface for text.
+
+        Pass cache=False for text that changes nearly every frame (counters),
+        so it does not push stable text out of the cache.
+        """
+        if not cache:
+            return self.get_font(size, name).render(text, True, color)
+        key = (text, tuple(color), size, name)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = surfaces[key] = self.get_font(size, name).render(text, True, color)
+        if len(surfaces) > self.max_surfaces:
+            surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached fonts and surfaces, e.g. after changing the font."""
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+# Shared by everything that draws HUD text
+text_renderer = TextRenderer()
@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import pygame
+import pytest
+from src.utils.input_source import ScriptedInputSource
+from src.utils.replay import start_recording
+from src.utils.replay_runner import GOLDEN_FILE, load_golden, run_all
+from src.utils.settings_manager import SettingsManager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TICKS = 300
+INTERVAL = 60
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A copy of the game's config, levels and assets to run from."""
+    for name in ("config", "levels", "assets"):
+        shutil.copytree(os.path.join(PROJECT_ROOT, "src", name), tmp_path / "src" / name,
+                        ignore=shutil.ignore_patterns("__levelcache__"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    yield tmp_path
+    pygame.quit()
+
+
+def record(path: str):
+    from src.controllers.game_controller import GameController
+
+    source = ScriptedInputSource()
+    game = GameController(headless=True, input_source=source)
+    recorder = start_recording(game)
+    controls = game.settings.get("controls")
+    source.press(controls["move_right"])
+    for tick in range(TICKS):
+        if tick == 100:
+            source.release(controls["move_right"])
+            source.press(controls["jump"])
+        elif tick == 110:
+            source.release(controls["jump"])
+        game.handle_events()
+        game.step()
+    recorder.save(path, game.settings)
+
+
+def set_gravity(value: float):
+    settings = SettingsManager()
+    with open(settings.config_path, 'r') as f:
+        config = json.load(f)
+    config["physics"]["gravity"] = value
+    with open(settings.config_path, 'w') as f:
+        json.dump(config, f, indent=4)
+    # Same size as before, so make sure the mtime moves too
+    stat = os.stat(settings.config_path)
+    os.utime(settings.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert settings.reload_if_changed()
+
+
+def test_bless_after_gameplay_change_passes_rerun(project):
+    replays = project / "replays"
+    record(str(replays / "run.replay"))
+    assert run_all(str(replays), jobs=1, interval=INTERVAL) == 0
+
+    set_gravity(0.8)
+    # The recording's own hashes no longer match
+    assert run_all(str(replays), jobs=1, interval=INTERVAL) == 1
+
+    assert run_all(str(replays), jobs=1, interval=INTERVAL, bless=True) == 0
+    golden = load_golden(str(replays))["run.replay"]
+    assert sorted(int(tick) for tick in golden["checkpoints"]) == list(range(0, TICKS, INTERVAL))
+    assert (replays / GOLDEN_FILE).exists()
+
+    assert run_all(str(replays), jobs=1, interval=INTERVAL) == 0